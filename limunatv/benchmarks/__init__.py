@@ -0,0 +1 @@
+# Offline benchmarks for the LuminaTV backend (not collected by manage.py test)
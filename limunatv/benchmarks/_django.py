@@ -0,0 +1,36 @@
+"""
+Shared setup for benchmark scripts: boots Django against a throwaway test
+database so benchmarks never touch ``db.sqlite3``.
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def setup():
+    """Configure Django for a benchmark run."""
+    sys.path.insert(0, str(PROJECT_ROOT))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'limunatv.settings')
+    os.environ.setdefault('DJANGO_SECURE_SSL_REDIRECT', 'False')
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database(keepdb=False):
+    """Create (and afterwards destroy) a migrated test database."""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+        teardown_test_environment()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark the JSON encoders on a 10k-cast payload.
+
+Compares the old path (dicts from ``.values()`` through ``JsonResponse``'s
+stdlib encoder) with the chunked encoders behind
+``limunatv.fastjson.streaming_json_response``: objects, and the compact
+``rows`` layout that encodes ``values_list()`` tuples directly. Each runs on
+the stdlib backend and, when installed, on orjson.
+
+Usage (from limunatv/):
+    python -m benchmarks.bench_json
+    python -m benchmarks.bench_json --rows 50000 --repeat 10
+"""
+
+import argparse
+import importlib
+import json
+import sys
+import time
+from unittest import mock
+
+from . import _django
+
+FIELDS = ('id', 'name', 'popularity', 'photo')
+
+
+def synthetic_rows(count):
+    return [
+        (i, f'Cast Member Zoë {i}', i % 997, f'casts/photos/ab/cd/{i:064x}.jpg' if i % 3 else '')
+        for i in range(1, count + 1)
+    ]
+
+
+def best_of(repeat, fn):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = len(fn())
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, size
+
+
+def load_fastjson(use_orjson):
+    """Import limunatv.fastjson with or without orjson available."""
+    sys.modules.pop('limunatv.fastjson', None)
+    if use_orjson:
+        return importlib.import_module('limunatv.fastjson')
+    with mock.patch.dict(sys.modules, {'orjson': None}):
+        return importlib.import_module('limunatv.fastjson')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    _django.setup()
+    from django.core.serializers.json import DjangoJSONEncoder
+
+    rows = synthetic_rows(args.rows)
+    scenarios = {
+        'JsonResponse (values() dicts)': lambda: json.dumps(
+            {'results': [dict(zip(FIELDS, row)) for row in rows]}, cls=DjangoJSONEncoder).encode(),
+    }
+    backends = [False]
+    try:
+        import orjson  # noqa: F401
+        backends.append(True)
+    except ImportError:
+        print('orjson not installed; benchmarking the stdlib fallback only\n')
+
+    for use_orjson in backends:
+        fastjson = load_fastjson(use_orjson)
+        scenarios[f'{fastjson.BACKEND}: streamed objects'] = (
+            lambda fj=fastjson: b''.join(fj.iter_json_array(rows, fj._encode_objects(FIELDS))))
+        scenarios[f'{fastjson.BACKEND}: streamed rows'] = (
+            lambda fj=fastjson: b''.join(fj.iter_json_array(rows, fj._encode_rows)))
+
+    print(f'{args.rows:,} casts, best of {args.repeat}\n')
+    print(f'{"encoder":<32} {"ms":>8} {"bytes":>10}')
+    for label, fn in scenarios.items():
+        ms, size = best_of(args.repeat, fn)
+        print(f'{label:<32} {ms:>8.2f} {size:>10,}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+Count database queries per request, before and after the stateless
+session/auth setup.
+
+"before" runs the stock Django middleware with database sessions and
+ModelBackend; "after" runs the project settings. Every request comes from a
+logged-in staff client (the worst case: it sends a session cookie on every
+call) and is repeated so cached lookups count at their steady state.
+
+Usage (from limunatv/):
+    python -m benchmarks.bench_queries
+"""
+
+import argparse
+
+from . import _django
+
+PATHS = ['/health/', '/api/casts/', '/api/casts/autocomplete/?q=a', '/admin/', '/admin/casts/cast/']
+
+STOCK_MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+
+def count_queries(client, path, repeat):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    counts = []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(path)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        counts.append(len(ctx))
+    return counts[-1], response.status_code
+
+
+def run(label, repeat):
+    from django.contrib.auth import get_user_model
+    from django.core.cache import cache
+    from django.test import Client
+
+    cache.clear()
+    client = Client(HTTP_HOST='localhost')
+    client.force_login(get_user_model().objects.get(username='bench'))
+    return {path: count_queries(client, path, repeat) for path in PATHS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    _django.setup()
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.test.utils import override_settings
+
+    # The admin templates need static URLs without a collectstatic run.
+    plain_static = override_settings(STORAGES=dict(settings.STORAGES, staticfiles={
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}))
+
+    with plain_static, _django.test_database():
+        get_user_model().objects.create_superuser('bench', 'bench@example.com', 'bench-password')
+        with override_settings(
+            MIDDLEWARE=STOCK_MIDDLEWARE,
+            SESSION_ENGINE='django.contrib.sessions.backends.db',
+            AUTHENTICATION_BACKENDS=['django.contrib.auth.backends.ModelBackend'],
+        ):
+            before = run('before', args.repeat)
+        # What a deployment with a shared cache (REDIS_URL) runs.
+        with override_settings(
+            SESSION_ENGINE='django.contrib.sessions.backends.cached_db',
+            AUTHENTICATION_BACKENDS=['limunatv.auth_backends.CachedModelBackend'],
+        ):
+            after = run('after', args.repeat)
+
+    print(f'{"path":<32} {"before":>7} {"after":>7}')
+    for path in PATHS:
+        print(f'{path:<32} {before[path][0]:>7} {after[path][0]:>7}')
+
+
+if __name__ == '__main__':
+    main()
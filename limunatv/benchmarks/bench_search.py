@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""
+Benchmark cast search on a synthetic catalog.
+
+Compares the old admin behaviour (``name__icontains`` -> LIKE '%term%') with
+the FTS-backed ``casts.search`` functions.
+
+Usage (from limunatv/):
+    python -m benchmarks.bench_search                 # 500k rows
+    python -m benchmarks.bench_search --rows 50000 --queries 200
+"""
+
+import argparse
+import statistics
+import time
+
+from . import _django
+from .datagen import seed, synthetic_queries
+
+
+def timed(fn, queries):
+    samples = []
+    for query in queries:
+        started = time.perf_counter()
+        fn(query)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        'p50': statistics.median(samples),
+        'p95': samples[int(len(samples) * 0.95) - 1],
+        'max': samples[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    _django.setup()
+    from casts.models import Cast
+    from casts.search import filter_queryset, search_casts
+
+    queries = list(synthetic_queries(args.queries))
+    with _django.test_database():
+        print(f'Loading {args.rows:,} synthetic casts...')
+        elapsed = seed(args.rows)
+        print(f'  loaded in {elapsed:.1f}s ({args.rows / elapsed:,.0f} rows/s, FTS triggers included)')
+
+        scenarios = {
+            'LIKE icontains': lambda q: list(
+                Cast.objects.filter(name__icontains=q).order_by('name')[:args.limit]),
+            'FTS ranked search': lambda q: search_casts(q, limit=args.limit),
+            'FTS admin filter': lambda q: list(
+                filter_queryset(Cast.objects.order_by('-pk'), q)[:args.limit]),
+        }
+        print(f'\n{"scenario":<20} {"p50 ms":>9} {"p95 ms":>9} {"max ms":>9}')
+        for label, fn in scenarios.items():
+            stats = timed(fn, queries)
+            print(f'{label:<20} {stats["p50"]:>9.2f} {stats["p95"]:>9.2f} {stats["max"]:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
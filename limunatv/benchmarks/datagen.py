@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""
+Synthetic data for benchmarks: cast names, search terms and photos.
+
+As a script it seeds the *configured* database (``db.sqlite3`` by default)
+so a local server has something to serve during ``benchmarks.loadtest``.
+
+Usage (from limunatv/):
+    python -m benchmarks.datagen --count 20000 --photos 200
+    python -m benchmarks.datagen --clear --count 5000
+"""
+
+import argparse
+import io
+import random
+import time
+
+from . import _django
+
+FIRST = ['Zoë', 'Tom', 'Amara', 'José', 'Chloé', 'Kwame', 'Ngozi', 'Björn', 'Aïsha',
+         'Mateo', 'Lena', 'Hiro', 'Nadia', 'Omar', 'Renée', 'Tobi', 'Yara', 'Émile']
+SYLLABLES = ['ka', 'lé', 'mo', 'nu', 'ri', 'sa', 'to', 'vé', 'ya', 'zo', 'ba', 'chi', 'do',
+             'fé', 'gu', 'ha', 'ji', 'ko', 'lu', 'mi', 'na', 'ö', 'pa', 'qui', 'ro']
+
+
+def _surname(rng):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def synthetic_names(count, seed=42):
+    rng = random.Random(seed)  # nosec B311
+    for _ in range(count):
+        yield f'{rng.choice(FIRST)} {_surname(rng)}'
+
+
+def synthetic_queries(count, seed=7):
+    """Mostly surname prefixes (as typed), with some full "first last" pairs."""
+    rng = random.Random(seed)  # nosec B311
+    for i in range(count):
+        surname = _surname(rng)
+        if i % 4 == 0:
+            yield f'{rng.choice(FIRST)} {surname}'
+        else:
+            yield surname[:rng.randint(3, len(surname))]
+
+
+def synthetic_photo(index, size=(320, 480)):
+    """Return JPEG bytes for a distinct, mildly compressible portrait-sized image."""
+    from PIL import Image, ImageDraw
+
+    rng = random.Random(index)  # nosec B311
+    image = Image.new('RGB', size, tuple(rng.randrange(256) for _ in range(3)))
+    draw = ImageDraw.Draw(image)
+    for _ in range(12):
+        box = sorted(rng.randrange(size[0]) for _ in range(2)), sorted(rng.randrange(size[1]) for _ in range(2))
+        draw.ellipse([box[0][0], box[1][0], box[0][1], box[1][1]],
+                     fill=tuple(rng.randrange(256) for _ in range(3)))
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=80)
+    return buffer.getvalue()
+
+
+def seed(count, photos=0, batch_size=5000, seed=42):
+    """Insert ``count`` synthetic casts; the first ``photos`` of them get a photo."""
+    from django.core.files.base import ContentFile
+
+    from casts.models import Cast
+
+    rng = random.Random(seed)  # nosec B311
+    started = time.perf_counter()
+    batch = []
+    for index, name in enumerate(synthetic_names(count, seed=seed)):
+        cast = Cast(name=name, popularity=int(rng.paretovariate(1.2)) % 100_000)
+        if index < photos:
+            cast.photo.save(f'bench-{index}.jpg', ContentFile(synthetic_photo(index)), save=False)
+        batch.append(cast)
+        if len(batch) >= batch_size:
+            Cast.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Cast.objects.bulk_create(batch)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Seed the configured database with synthetic casts.')
+    parser.add_argument('--count', type=int, default=20_000)
+    parser.add_argument('--photos', type=int, default=100, help='How many casts get a generated photo.')
+    parser.add_argument('--clear', action='store_true', help='Delete every existing cast first.')
+    args = parser.parse_args()
+
+    _django.setup()
+    from casts.models import Cast
+
+    if args.clear:
+        Cast.objects.all().delete()
+    elapsed = seed(args.count, photos=args.photos)
+    print(f'Seeded {args.count:,} casts ({args.photos:,} with photos) in {elapsed:.1f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,310 @@
+#!/usr/bin/env python
+"""
+Load-test a running server with scripted scenarios and compare to a baseline.
+
+Each scenario sends ``--requests`` requests from ``--concurrency`` threads
+and reports p50/p95/p99 latency, throughput and the error count. Nothing
+leaves the machine: point ``--base-url`` at a local ``runserver`` or
+gunicorn seeded with ``benchmarks.datagen``.
+
+Scenarios:
+    list       full catalog listing, mostly ``?format=rows``
+    search     full-text search with synthetic surname prefixes
+    complete   autocomplete with 1-4 character prefixes
+    health     liveness and readiness probes, interleaved
+    csp        a storm of CSP violation reports (POST)
+    media      ``Range`` requests against cast photos from the listing
+
+Only a 206 answer counts as a success for ``media``. The project serves
+media itself only with ``SERVE_MEDIA`` on (``DJANGO_SERVE_MEDIA=True``);
+``views_media.serve_media`` answers single-range requests, so the scenario
+also works against a media server such as nginx or a CDN.
+
+Results can be stored as a named baseline in ``benchmarks/baselines.json``
+(``--save-baseline``) and later runs checked against it (``--compare``);
+a p95 or throughput change worse than ``--threshold`` percent is flagged and
+the run exits with status 1. Baselines only mean something on the machine
+that recorded them, so name them after it (``--label``).
+
+The server must answer plain HTTP: with ``DEBUG`` off, settings.py turns on
+``SECURE_SSL_REDIRECT``, and every request is redirected to an https:// URL
+that runserver cannot answer (reported as ``cannot reach ...
+WRONG_VERSION_NUMBER``).
+
+Usage (from limunatv/):
+    python -m benchmarks.datagen --count 20000 --photos 200
+    DJANGO_SECURE_SSL_REDIRECT=False DJANGO_ALLOWED_HOSTS=127.0.0.1,localhost \
+        DJANGO_SERVE_MEDIA=True python manage.py runserver --noreload 8000 &
+    python -m benchmarks.loadtest --save-baseline
+    python -m benchmarks.loadtest --compare --threshold 15
+    python -m benchmarks.loadtest --scenario search --scenario media -n 2000 -c 16
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urljoin
+
+from .datagen import synthetic_queries
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+CSP_REPORT = {
+    'csp-report': {
+        'document-uri': 'https://luminatv.example/casts/',
+        'referrer': '',
+        'violated-directive': 'script-src-elem',
+        'effective-directive': 'script-src-elem',
+        'original-policy': "default-src 'self'; report-uri /csp-report/",
+        'blocked-uri': 'https://cdn.example.net/tracker.js',
+        'status-code': 200,
+    }
+}
+
+
+class Client:
+    """Minimal urllib client; one opener shared by all worker threads."""
+
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url.rstrip('/') + '/'
+        self.timeout = timeout
+        self.opener = urllib.request.build_opener()
+
+    def request(self, path, data=None, headers=None):
+        """Send one request and return ``(status, body_length)``."""
+        request = urllib.request.Request(
+            urljoin(self.base_url, path.lstrip('/')), data=data, headers=headers or {})
+        request.add_header('Accept-Encoding', 'br, gzip')
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                return response.status, len(response.read())
+        except urllib.error.HTTPError as exc:
+            exc.read()
+            return exc.code, 0
+
+    def get_json(self, path):
+        request = urllib.request.Request(urljoin(self.base_url, path.lstrip('/')))
+        with self.opener.open(request, timeout=self.timeout) as response:
+            return json.load(response)
+
+
+def _cycle(items):
+    """Thread-safe endless ``next()`` over ``items``."""
+    iterator, lock = itertools.cycle(items), threading.Lock()
+
+    def advance():
+        with lock:
+            return next(iterator)
+
+    return advance
+
+
+def scenario_list(client, args):
+    pages = _cycle(['api/casts/?format=rows', 'api/casts/?format=rows', 'api/casts/'])
+    return lambda: client.request(pages())
+
+
+def scenario_search(client, args):
+    terms = _cycle(list(synthetic_queries(500)))
+    return lambda: client.request(f'api/casts/search/?q={quote(terms())}')
+
+
+def scenario_complete(client, args):
+    rng = random.Random(3)  # nosec B311
+    terms = [q[:rng.randint(1, 4)] for q in synthetic_queries(500, seed=11)]
+    terms = _cycle(terms)
+    return lambda: client.request(f'api/casts/autocomplete/?q={quote(terms())}')
+
+
+def scenario_health(client, args):
+    paths = _cycle(['health/', 'health/', 'health/', 'health/ready/'])
+    return lambda: client.request(paths())
+
+
+def scenario_csp(client, args):
+    body = json.dumps(CSP_REPORT).encode()
+    headers = {'Content-Type': 'application/csp-report'}
+    return lambda: client.request('csp-report/', data=body, headers=headers)
+
+
+def scenario_media(client, args):
+    catalog = client.get_json('api/casts/?format=rows')
+    column = catalog['fields'].index('photo')
+    photos = [row[column] for row in catalog['results'] if row[column]][:500]
+    if not photos:
+        raise SystemExit('media: no cast photos found; seed with `python -m benchmarks.datagen --photos N`')
+    photos = _cycle(photos)
+    ranges = _cycle(['bytes=0-1023', 'bytes=1024-8191', 'bytes=-2048', 'bytes=0-'])
+
+    def request():
+        return client.request(photos(), headers={'Range': ranges()})
+
+    # A full 200 response means the server ignored the range.
+    request.expected_status = {206}
+    return request
+
+
+# Scenarios that run when no --scenario is given.
+DEFAULT_SCENARIOS = ('list', 'search', 'complete', 'health', 'csp', 'media')
+SCENARIOS = {
+    'list': scenario_list,
+    'search': scenario_search,
+    'complete': scenario_complete,
+    'health': scenario_health,
+    'csp': scenario_csp,
+    'media': scenario_media,
+}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def run_scenario(make_request, requests, concurrency, warmup):
+    """Fire ``requests`` calls of ``make_request`` and summarise the latencies.
+
+    A response counts as an error when its status is not in
+    ``make_request.expected_status``, if the scenario sets one, and otherwise
+    when it is 400 or above.
+    """
+    expected = getattr(make_request, 'expected_status', None)
+    for _ in range(warmup):
+        make_request()
+
+    def one(_):
+        started = time.perf_counter()
+        try:
+            status, size = make_request()
+            ok = status in expected if expected else status < 400
+        except (OSError, urllib.error.URLError):
+            ok, size = False, 0
+        return time.perf_counter() - started, ok, size
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - started
+
+    latencies = sorted(elapsed * 1000 for elapsed, _, _ in results)
+    return {
+        'requests': requests,
+        'errors': sum(1 for _, ok, _ in results if not ok),
+        'rps': round(requests / wall, 1),
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'mean_ms': round(statistics.fmean(latencies), 2),
+        'bytes': sum(size for _, _, size in results),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Return a list of regression messages for results worse than ``baseline``."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        limit = 1 + threshold / 100
+        if previous['p95_ms'] and current['p95_ms'] > previous['p95_ms'] * limit:
+            regressions.append(
+                f"{name}: p95 {current['p95_ms']:.2f} ms vs baseline {previous['p95_ms']:.2f} ms")
+        if previous['rps'] and current['rps'] * limit < previous['rps']:
+            regressions.append(
+                f"{name}: {current['rps']:,.1f} req/s vs baseline {previous['rps']:,.1f} req/s")
+        if current['errors'] > previous['errors']:
+            regressions.append(f"{name}: {current['errors']} errors vs baseline {previous['errors']}")
+    return regressions
+
+
+def load_baselines(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test a running LuminaTV server.')
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help=f'Scenario to run (repeatable; default: {", ".join(DEFAULT_SCENARIOS)}).')
+    parser.add_argument('-n', '--requests', type=int, default=500, help='Requests per scenario.')
+    parser.add_argument('-c', '--concurrency', type=int, default=8)
+    parser.add_argument('--warmup', type=int, default=20, help='Untimed requests per scenario.')
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--label', default='local', help='Baseline name (e.g. the machine).')
+    parser.add_argument('--baselines', default=BASELINES, help='Baseline file.')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the baseline.')
+    parser.add_argument('--compare', action='store_true', help='Fail on regressions against the baseline.')
+    parser.add_argument('--threshold', type=float, default=20.0,
+                        help='Allowed p95/throughput regression in percent.')
+    parser.add_argument('--json', metavar='PATH', help='Also write the results to PATH.')
+    args = parser.parse_args()
+
+    client = Client(args.base_url, args.timeout)
+    names = args.scenario or list(DEFAULT_SCENARIOS)
+    results = {}
+    print(f'{args.base_url}: {args.requests} requests x {len(names)} scenarios, concurrency {args.concurrency}')
+    print(f"\n{'scenario':<10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name in names:
+        try:
+            make_request = SCENARIOS[name](client, args)
+            result = results[name] = run_scenario(make_request, args.requests, args.concurrency, args.warmup)
+        except urllib.error.URLError as exc:
+            raise SystemExit(f'{name}: cannot reach {args.base_url} ({exc.reason})')
+        print(f"{name:<10}{result['rps']:>10,.1f}{result['p50_ms']:>10.2f}"
+              f"{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['errors']:>8}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump(results, fh, indent=2)
+
+    baselines = load_baselines(args.baselines)
+    status = 0
+    if args.compare:
+        baseline = baselines.get(args.label)
+        if baseline is None:
+            print(f'\nNo baseline named {args.label!r} in {args.baselines}; run with --save-baseline first.')
+            status = 2
+        else:
+            regressions = compare(results, baseline['results'], args.threshold)
+            if regressions:
+                print(f'\nRegressions beyond {args.threshold:g}% against {args.label!r}:')
+                for message in regressions:
+                    print(f'  {message}')
+                status = 1
+            else:
+                print(f'\nNo regressions beyond {args.threshold:g}% against {args.label!r}.')
+
+    if args.save_baseline:
+        previous = baselines.get(args.label, {}).get('results', {})
+        baselines[args.label] = {
+            'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'results': dict(previous, **results),
+        }
+        with open(args.baselines, 'w', encoding='utf-8') as fh:
+            json.dump(baselines, fh, indent=2, sort_keys=True)
+            fh.write('\n')
+        print(f'Saved baseline {args.label!r} to {args.baselines}')
+
+    sys.exit(status)
+
+
+if __name__ == '__main__':
+    main()
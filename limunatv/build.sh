@@ -7,8 +7,15 @@ pip install --only-binary :all: -r requirements.txt
 echo "Running migrations..."
 python manage.py migrate --no-input
 
+echo "Refreshing planner statistics..."
+python manage.py analyze_db
+
 echo "Collecting static files..."
 mkdir -p ./staticfiles
-python manage.py collectstatic --noinput --clear --verbosity 2
+# No --clear: unchanged files keep their compressed variants between builds
+python manage.py collectstatic --noinput --verbosity 2
+
+echo "Building catalog snapshot..."
+python manage.py build_catalog_snapshot
 
 echo "Build complete!"
@@ -1,8 +1,95 @@
-from django.contrib import admin
-from .models import Cast
+from django.contrib import admin, messages
+from django.utils import timezone
+from django.utils.html import format_html
+
+from limunatv.pagination import EstimatedCountPaginator
+
+from .models import Cast, photo_storage
+from .search import filter_queryset
+from .snapshots import schedule_rebuild
+from .thumbnails import existing_thumbnail
+
+BATCH_SIZE = 1000
+
+
+def batched_pks(queryset, batch_size=BATCH_SIZE):
+    """Yield the primary keys of ``queryset`` in lists of ``batch_size``.
+
+    Pages by ``pk > last`` rather than OFFSET, so rows removed by an earlier
+    batch do not shift later ones.
+    """
+    pks = queryset.order_by('pk').values_list('pk', flat=True)
+    last = None
+    while True:
+        batch = list((pks if last is None else pks.filter(pk__gt=last))[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last = batch[-1]
 
 
 @admin.register(Cast)
 class CastAdmin(admin.ModelAdmin):
-    list_display = ('name',)
+    list_display = ('thumbnail', 'name', 'popularity', 'updated_at')
+    list_display_links = ('name',)
     search_fields = ('name',)
+    # A total order served by casts_cast_name_id_idx, so every page is an
+    # index range rather than a sort.
+    ordering = ('name', 'pk')
+    # No COUNT(*) over the whole table on every page (see EstimatedCountPaginator).
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ['reset_popularity']
+
+    def get_search_results(self, request, queryset, search_term):
+        # Use the full-text index instead of LIKE '%term%' scans.
+        if not search_term.strip():
+            return queryset, False
+        return filter_queryset(queryset, search_term, using=queryset.db), False
+
+    @admin.display(description='Photo')
+    def thumbnail(self, obj):
+        # Never rendered here: a page of new photos would mean a page of
+        # image decodes (see casts.thumbnails).
+        name = existing_thumbnail(obj.photo.name) if obj.photo else None
+        if name is None:
+            return ''
+        return format_html(
+            '<img src="{}" alt="" loading="lazy" style="max-width:48px;max-height:48px">',
+            photo_storage().url(name),
+        )
+
+    def get_deleted_objects(self, objs, request):
+        # Nothing references a cast, so for large selections the confirmation
+        # page shows a count instead of building a link for every object.
+        count = len(objs) if isinstance(objs, list) else objs.count()
+        if count <= self.list_per_page:
+            return super().get_deleted_objects(objs, request)
+        perms_needed = set() if self.has_delete_permission(request) else {self.opts.verbose_name}
+        summary = f'{count:,} {self.opts.verbose_name_plural}'
+        return [summary], {self.opts.verbose_name_plural: count}, perms_needed, []
+
+    def delete_queryset(self, request, queryset):
+        # One transaction per batch keeps write locks short on a large selection.
+        for pks in batched_pks(queryset):
+            Cast.objects.filter(pk__in=pks).delete()
+
+    def update_in_batches(self, queryset, **values):
+        """``queryset.update(**values)`` in batches; returns the number of rows.
+
+        Bulk updates skip model signals, so autocomplete picks the changes
+        up at its next periodic refresh; the catalog snapshot is rebuilt
+        explicitly.
+        """
+        values.setdefault('updated_at', timezone.now())
+        updated = sum(
+            Cast.objects.filter(pk__in=pks).update(**values)
+            for pks in batched_pks(queryset)
+        )
+        schedule_rebuild()
+        return updated
+
+    @admin.action(description='Reset popularity of selected casts', permissions=['change'])
+    def reset_popularity(self, request, queryset):
+        updated = self.update_in_batches(queryset, popularity=0)
+        self.message_user(request, f'Reset popularity of {updated:,} casts.', messages.SUCCESS)
@@ -1,6 +1,23 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_migrate, post_save
+
+
+def _ensure_search_index(sender, using, **kwargs):
+    from .search import ensure_search_index
+    ensure_search_index(using)
 
 
 class CastsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'casts'
+
+    def ready(self):
+        from . import autocomplete, snapshots, thumbnails
+
+        post_migrate.connect(_ensure_search_index, sender=self)
+        Cast = self.get_model('Cast')
+        post_save.connect(autocomplete.cast_saved, sender=Cast)
+        post_save.connect(thumbnails.cast_saved, sender=Cast)
+        post_delete.connect(autocomplete.cast_deleted, sender=Cast)
+        post_save.connect(snapshots.cast_changed, sender=Cast)
+        post_delete.connect(snapshots.cast_changed, sender=Cast)
@@ -0,0 +1,225 @@
+"""
+In-process prefix index for as-you-type cast suggestions.
+
+Every worker keeps a sorted list of normalized name keys and answers
+autocomplete requests with ``bisect`` lookups, so a keystroke never reaches
+the database. Each cast is indexed under its full name and under every
+later word ("tom hanks" and "hanks"), with accents and case folded away.
+
+The index holds at most ``CASTS_AUTOCOMPLETE_MAX_ENTRIES`` casts (the most
+popular ones), is updated in place when a ``Cast`` save/delete commits, and is
+rebuilt in the background every ``CASTS_AUTOCOMPLETE_REFRESH_SECONDS`` to pick
+up changes made by other workers or by bulk queries that skip signals.
+"""
+
+import heapq
+import logging
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+
+logger = logging.getLogger(__name__)
+
+
+def normalize(text):
+    """Fold case and strip diacritics: ``'Zoë Saldaña'`` -> ``'zoe saldana'``."""
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(stripped.casefold().split())
+
+
+def name_keys(name):
+    """Return the keys a name is reachable under (full name, then each later word)."""
+    words = normalize(name).split(' ')
+    return tuple(' '.join(words[i:]) for i in range(len(words)) if words[i])
+
+
+class PrefixIndex:
+    """Sorted-array prefix index of cast names, bounded to ``max_entries`` casts."""
+
+    def __init__(self, max_entries=50_000):
+        self.max_entries = max_entries
+        self.loaded_at = None
+        self._keys = []      # sorted [(key, cast_id), ...]
+        self._entries = {}   # cast_id -> (name, popularity, keys)
+        self._heap = []      # (popularity, cast_id), may hold stale pairs
+        self._short = {}     # (prefix, limit) -> suggestions, for 1-2 char prefixes
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def build(self, rows):
+        """Replace the index contents with ``(id, name, popularity)`` rows."""
+        keys, entries = [], {}
+        for cast_id, name, popularity in rows:
+            if len(entries) >= self.max_entries:
+                break
+            cast_keys = name_keys(name)
+            entries[cast_id] = (name, popularity, cast_keys)
+            keys.extend((key, cast_id) for key in cast_keys)
+        keys.sort()
+        heap = [(entry[1], cast_id) for cast_id, entry in entries.items()]
+        heapq.heapify(heap)
+        with self._lock:
+            self._keys, self._entries, self._heap, self._short = keys, entries, heap, {}
+            self.loaded_at = time.monotonic()
+
+    def load_queryset(self, using='default'):
+        """The ``(id, name, popularity)`` rows ``load`` reads, most popular first."""
+        from .models import Cast
+
+        return (
+            Cast.objects.using(using)
+            .order_by('-popularity', 'name')
+            .values_list('id', 'name', 'popularity')[:self.max_entries]
+        )
+
+    def load(self, using='default'):
+        """Build the index from the most popular casts in the database."""
+        self.build(self.load_queryset(using).iterator(chunk_size=5000))
+
+    def _remove(self, cast_id):
+        entry = self._entries.pop(cast_id, None)
+        if entry is None:
+            return
+        self._short.clear()
+        for key in entry[2]:
+            pos = bisect_left(self._keys, (key, cast_id))
+            if pos < len(self._keys) and self._keys[pos] == (key, cast_id):
+                del self._keys[pos]
+
+    def _least_popular(self):
+        """Return the id of the least popular indexed cast.
+
+        Updates and removals leave stale pairs in the heap instead of
+        searching for them; they are skipped here, and the heap is rebuilt
+        once they outnumber the live ones.
+        """
+        heap, entries = self._heap, self._entries
+        if len(heap) > 2 * len(entries):
+            heap[:] = [(entry[1], cast_id) for cast_id, entry in entries.items()]
+            heapq.heapify(heap)
+        while heap:
+            popularity, cast_id = heap[0]
+            entry = entries.get(cast_id)
+            if entry is not None and entry[1] == popularity:
+                return cast_id
+            heapq.heappop(heap)
+        return None
+
+    def remove(self, cast_id):
+        with self._lock:
+            self._remove(cast_id)
+
+    def upsert(self, cast_id, name, popularity):
+        """Add or update one cast, evicting the least popular one if full."""
+        with self._lock:
+            self._remove(cast_id)
+            if len(self._entries) >= self.max_entries:
+                victim = self._least_popular()
+                if victim is None or self._entries[victim][1] >= popularity:
+                    return
+                self._remove(victim)
+            cast_keys = name_keys(name)
+            self._entries[cast_id] = (name, popularity, cast_keys)
+            heapq.heappush(self._heap, (popularity, cast_id))
+            self._short.clear()
+            for key in cast_keys:
+                insort(self._keys, (key, cast_id))
+
+    def suggest(self, prefix, limit=10):
+        """Return up to ``limit`` ``(id, name)`` pairs whose name starts with ``prefix``.
+
+        Matches are ordered by popularity, then name. Results for one and
+        two character prefixes, which match the widest ranges, are memoized
+        until the index next changes.
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        with self._lock:
+            if (prefix, limit) in self._short:
+                return self._short[(prefix, limit)]
+            keys, entries = self._keys, self._entries
+            matched = set()
+            for pos in range(bisect_left(keys, (prefix,)), len(keys)):
+                key, cast_id = keys[pos]
+                if not key.startswith(prefix):
+                    break
+                matched.add(cast_id)
+            best = heapq.nsmallest(
+                limit, matched, key=lambda pk: (-entries[pk][1], entries[pk][0]))
+            result = [(pk, entries[pk][0]) for pk in best]
+            if len(prefix) <= 2:
+                self._short[(prefix, limit)] = result
+            return result
+
+
+index = PrefixIndex()
+_refresh_lock = threading.Lock()
+
+
+def _settings():
+    from django.conf import settings
+
+    return (
+        getattr(settings, 'CASTS_AUTOCOMPLETE_MAX_ENTRIES', 50_000),
+        getattr(settings, 'CASTS_AUTOCOMPLETE_REFRESH_SECONDS', 300),
+    )
+
+
+def _refresh():
+    from django.db import connections
+
+    try:
+        index.max_entries = _settings()[0]
+        index.load()
+    except Exception:
+        logger.exception('Autocomplete index refresh failed')
+    finally:
+        _refresh_lock.release()
+        if threading.current_thread() is not threading.main_thread():
+            connections.close_all()
+
+
+def warm_index():
+    """Load the index at worker start (called from wsgi/asgi)."""
+    if _refresh_lock.acquire(blocking=False):
+        _refresh()
+
+
+def get_index():
+    """Return the shared index, loading it or scheduling a background refresh."""
+    refresh_seconds = _settings()[1]
+    if index.loaded_at is None:
+        _refresh_lock.acquire()  # waits for a load that is already running
+        if index.loaded_at is None:
+            _refresh()
+        else:
+            _refresh_lock.release()
+    elif time.monotonic() - index.loaded_at > refresh_seconds:
+        if _refresh_lock.acquire(blocking=False):
+            index.loaded_at = time.monotonic()  # don't schedule twice
+            threading.Thread(target=_refresh, name='autocomplete-refresh', daemon=True).start()
+    return index
+
+
+# The signal handlers apply changes only once the transaction commits, so a
+# rolled-back save never shows up as a suggestion.
+
+def cast_saved(sender, instance, using, **kwargs):
+    from django.db import transaction
+
+    if index.loaded_at is not None:
+        values = (instance.pk, instance.name, instance.popularity)
+        transaction.on_commit(lambda: index.upsert(*values), using=using)
+
+
+def cast_deleted(sender, instance, using, **kwargs):
+    from django.db import transaction
+
+    if index.loaded_at is not None:
+        pk = instance.pk
+        transaction.on_commit(lambda: index.remove(pk), using=using)
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from casts.snapshots import build_snapshot, snapshot_root
+
+
+class Command(BaseCommand):
+    help = (
+        'Render the cast catalog into versioned, precompressed JSON files under '
+        'CASTS_SNAPSHOT_ROOT. Does nothing when the catalog has not changed since the last build.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--force', action='store_true',
+                            help='Rebuild even if the catalog looks unchanged.')
+        parser.add_argument('--watch', type=int, metavar='SECONDS',
+                            help='Keep running and check for changes every SECONDS, which also '
+                                 'catches bulk writes that send no model signals (provided they '
+                                 'set updated_at; see casts.snapshots).')
+        parser.add_argument('--retain-seconds', type=int,
+                            help='Keep superseded files this long (default: CASTS_SNAPSHOT_RETAIN_SECONDS).')
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        force = options['force']
+        while True:
+            self.build(force, options['database'], options['retain_seconds'])
+            if not options['watch']:
+                return
+            force = False
+            time.sleep(max(1, options['watch']))
+
+    def build(self, force, using, retain_seconds):
+        started = time.monotonic()
+        manifest, written = build_snapshot(force=force, using=using, retain_seconds=retain_seconds)
+        if written is None:
+            if self.verbosity >= 2:
+                self.stdout.write(f'Catalog unchanged (version {manifest["version"]}).')
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'Catalog snapshot {manifest["version"]}: {manifest["count"]:,} casts, '
+            f'{written} of {len(manifest["shards"])} shards rewritten in '
+            f'{time.monotonic() - started:.2f}s into {snapshot_root()}.'
+        ))
@@ -0,0 +1,42 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+
+from casts.models import Cast
+from casts.thumbnails import ensure_thumbnail, existing_thumbnail, thumbnail_name
+
+
+class Command(BaseCommand):
+    help = (
+        'Render the admin thumbnails that are missing, e.g. for photos written by bulk '
+        'queries. The changelist only shows thumbnails that already exist.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Photos decoded concurrently (default: 4).')
+
+    def handle(self, *args, **options):
+        photos = (
+            Cast.objects.using(options['database'])
+            .exclude(photo='').exclude(photo__isnull=True)
+            .order_by().values_list('photo', flat=True).distinct()
+            .iterator(chunk_size=2000)
+        )
+        missing = (name for name in photos if thumbnail_name(name) and not existing_thumbnail(name))
+        started = time.perf_counter()
+        rendered, failed = 0, 0
+        with ThreadPoolExecutor(max_workers=max(1, options['workers'])) as pool:
+            while batch := list(islice(missing, 500)):
+                for name in pool.map(ensure_thumbnail, batch):
+                    if name is None:
+                        failed += 1
+                    else:
+                        rendered += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Rendered {rendered:,} thumbnails in {time.perf_counter() - started:.1f}s '
+            f'({failed:,} photos could not be read)'
+        ))
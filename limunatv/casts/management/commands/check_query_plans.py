@@ -0,0 +1,51 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from casts.query_plans import HOT_QUERIES
+
+# Plan fragments that mean a query is no longer served by an index.
+REGRESSIONS = {
+    'sqlite': [
+        ('scan', re.compile(r'\bSCAN \w+(?! USING)\s*$', re.MULTILINE)),  # full table scan
+        ('sort', re.compile(r'USE TEMP B-TREE FOR (ORDER|GROUP) BY')),     # sort without index
+    ],
+    'postgresql': [
+        ('scan', re.compile(r'Seq Scan on')),
+    ],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on the hot queries registered in casts.query_plans and fail if any "
+        "of them regressed to a full table scan or an unindexed sort."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--show-plans', action='store_true', help='Print every query plan.')
+
+    def handle(self, *args, **options):
+        using = options['database']
+        vendor = connections[using].vendor
+        patterns = REGRESSIONS.get(vendor)
+        if patterns is None:
+            raise CommandError(f'No query plan rules for the {vendor} backend.')
+
+        failures = []
+        for label, (build, allowed) in HOT_QUERIES.items():
+            plan = build(using).explain()
+            bad = [p.pattern for kind, p in patterns if kind not in allowed and p.search(plan)]
+            if bad:
+                failures.append(label)
+                self.stdout.write(self.style.ERROR(f'✗ {label}'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'✓ {label}'))
+            if bad or options['show_plans']:
+                self.stdout.write('    ' + plan.replace('\n', '\n    '))
+
+        if failures:
+            raise CommandError(f'{len(failures)} hot query plan(s) regressed: {", ".join(failures)}')
+        self.stdout.write(self.style.SUCCESS(f'All {len(HOT_QUERIES)} hot queries use indexes.'))
@@ -0,0 +1,55 @@
+import csv
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from casts.models import Cast
+
+FIELDS = ('id', 'name', 'popularity', 'photo')
+
+
+class Command(BaseCommand):
+    help = 'Stream every cast to a CSV or JSON Lines file with constant memory use.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Output file, or '-' for stdout.")
+        parser.add_argument('--format', choices=['csv', 'jsonl'])
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Rows fetched from the database per round trip (default: 2000).')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('csv' if path.endswith('.csv') else 'jsonl')
+        rows = (
+            Cast.objects.order_by('pk')
+            .values_list(*FIELDS)
+            .iterator(chunk_size=max(1, options['chunk_size']))
+        )
+
+        try:
+            stream = sys.stdout if path == '-' else open(path, 'w', newline='', encoding='utf-8')
+        except OSError as exc:
+            raise CommandError(f'Cannot open {path}: {exc.strerror}')
+
+        started = time.perf_counter()
+        count = 0
+        try:
+            if fmt == 'csv':
+                writer = csv.writer(stream)
+                writer.writerow(FIELDS)
+                for count, row in enumerate(rows, 1):
+                    writer.writerow(row)
+            else:
+                for count, row in enumerate(rows, 1):
+                    stream.write(json.dumps(dict(zip(FIELDS, row)), ensure_ascii=False))
+                    stream.write('\n')
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+
+        elapsed = time.perf_counter() - started
+        self.stderr.write(self.style.SUCCESS(
+            f'Exported {count:,} casts in {elapsed:.1f}s ({count / max(elapsed, 1e-9):,.0f} rows/s)'
+        ))
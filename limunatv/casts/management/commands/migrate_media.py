@@ -0,0 +1,124 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from casts.models import Cast
+from casts.snapshots import refresh_snapshot
+from casts.thumbnails import THUMBNAIL_DIR, ensure_thumbnail, thumbnail_name
+from limunatv.storage import CONTENT_ADDRESSED_RE
+
+
+class Command(BaseCommand):
+    help = (
+        'Move existing cast photos into content-addressed storage (deduplicating identical '
+        'files) and optionally delete photo files that no cast references any more.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Rows updated per transaction (default: 500).')
+        parser.add_argument('--reclaim', action='store_true',
+                            help='Delete photos and thumbnails that no cast references.')
+        parser.add_argument('--grace-seconds', type=int, default=3600,
+                            help='Never reclaim files younger than this, so uploads whose row '
+                                 'is not saved yet survive (default: 3600).')
+        parser.add_argument('--dry-run', action='store_true', help='Report only; change nothing.')
+
+    def handle(self, *args, **options):
+        field = Cast._meta.get_field('photo')
+        self.storage = field.storage
+        self.dry_run = options['dry_run']
+
+        self.migrate(max(1, options['batch_size']))
+        if options['reclaim']:
+            self.reclaim(field.upload_to.rstrip('/'), options['grace_seconds'])
+
+    def migrate(self, batch_size):
+        rows = (
+            Cast.objects.exclude(photo='').exclude(photo__isnull=True)
+            .order_by('pk').only('pk', 'photo').iterator(chunk_size=batch_size)
+        )
+        moved, missing, pending = 0, 0, []
+        old_names, new_names = [], {}
+        for cast in rows:
+            name = cast.photo.name
+            if CONTENT_ADDRESSED_RE.search(name):
+                continue
+            if name in new_names:  # file shared with an earlier row
+                if not self.dry_run:
+                    cast.photo.name = new_names[name]
+                    pending.append(cast)
+                continue
+            if not self.storage.exists(name):
+                missing += 1
+                self.stderr.write(self.style.WARNING(f'Cast {cast.pk}: {name} is missing'))
+                continue
+            moved += 1
+            if self.dry_run:
+                new_names[name] = name
+                continue
+            with self.storage.open(name, 'rb') as fh:
+                cast.photo.name = new_names[name] = self.storage.save(name, fh)
+            ensure_thumbnail(cast.photo.name)
+            pending.append(cast)
+            old_names.append(name)
+            if len(pending) >= batch_size:
+                self._flush(pending, old_names)
+        self._flush(pending, old_names)
+        if moved and not self.dry_run:
+            refresh_snapshot()
+        verb = 'Would move' if self.dry_run else 'Moved'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {moved:,} photo files ({missing:,} missing files skipped)'))
+
+    def _flush(self, pending, old_names):
+        if pending:
+            # bulk_update() skips auto_now; the photo URL is part of the
+            # catalog, so snapshots must see these rows as changed.
+            now = timezone.now()
+            for cast in pending:
+                cast.updated_at = now
+            with transaction.atomic():
+                Cast.objects.bulk_update(pending, ['photo', 'updated_at'])
+            # Old files are only removed once the rows point at the new ones.
+            for name in old_names:
+                self.storage.delete(name)
+        pending.clear()
+        old_names.clear()
+
+    def reclaim(self, directory, grace_seconds):
+        referenced = set(
+            Cast.objects.exclude(photo='').exclude(photo__isnull=True)
+            .values_list('photo', flat=True).iterator(chunk_size=5000)
+        )
+        # Thumbnails live under their own directory, one subdirectory per size.
+        thumbnails_root = self.storage.path(THUMBNAIL_DIR)
+        sizes = os.listdir(thumbnails_root) if os.path.isdir(thumbnails_root) else []
+        referenced.update(
+            thumbnail_name(name, size)
+            for name in list(referenced) for size in sizes if size.isdigit()
+        )
+        cutoff = time.time() - grace_seconds
+        count, reclaimed = 0, 0
+        for root in (self.storage.path(directory), thumbnails_root):
+            count, reclaimed = self._reclaim_tree(root, referenced, cutoff, count, reclaimed)
+        verb = 'Would reclaim' if self.dry_run else 'Reclaimed'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {count:,} orphaned files ({reclaimed / (1024 * 1024):.1f} MB)'
+        ))
+
+    def _reclaim_tree(self, root, referenced, cutoff, count, reclaimed):
+        for dirpath, _dirnames, filenames in os.walk(root):
+            for filename in filenames:
+                full_path = os.path.join(dirpath, filename)
+                name = os.path.relpath(full_path, self.storage.location).replace(os.sep, '/')
+                stat = os.stat(full_path)
+                if name in referenced or stat.st_mtime > cutoff:
+                    continue
+                count += 1
+                reclaimed += stat.st_size
+                if not self.dry_run:
+                    os.remove(full_path)
+        return count, reclaimed
@@ -0,0 +1,58 @@
+from django.db import migrations
+
+# The SQL is spelled out here rather than imported from casts.search, so this
+# migration keeps doing what it did when it was written.
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS casts_cast_fts USING fts5("
+    "name, content='casts_cast', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS casts_cast_fts_ai AFTER INSERT ON casts_cast BEGIN "
+    "INSERT INTO casts_cast_fts(rowid, name) VALUES (new.id, new.name); END",
+    "CREATE TRIGGER IF NOT EXISTS casts_cast_fts_ad AFTER DELETE ON casts_cast BEGIN "
+    "INSERT INTO casts_cast_fts(casts_cast_fts, rowid, name) VALUES ('delete', old.id, old.name); END",
+    "CREATE TRIGGER IF NOT EXISTS casts_cast_fts_au AFTER UPDATE OF name ON casts_cast BEGIN "
+    "INSERT INTO casts_cast_fts(casts_cast_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+    "INSERT INTO casts_cast_fts(rowid, name) VALUES (new.id, new.name); END",
+    "INSERT INTO casts_cast_fts(casts_cast_fts) VALUES ('rebuild')",
+]
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS casts_cast_fts_ai",
+    "DROP TRIGGER IF EXISTS casts_cast_fts_ad",
+    "DROP TRIGGER IF EXISTS casts_cast_fts_au",
+    "DROP TABLE IF EXISTS casts_cast_fts",
+]
+POSTGRESQL_CREATE = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS casts_cast_name_tsv "
+    "ON casts_cast USING GIN (to_tsvector('simple', name))",
+    "CREATE INDEX IF NOT EXISTS casts_cast_name_trgm "
+    "ON casts_cast USING GIN (name gin_trgm_ops)",
+]
+POSTGRESQL_DROP = [
+    "DROP INDEX IF EXISTS casts_cast_name_tsv",
+    "DROP INDEX IF EXISTS casts_cast_name_trgm",
+]
+
+
+def _run(schema_editor, statements):
+    for sql in statements.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(sql)
+
+
+def create_search_index(apps, schema_editor):
+    _run(schema_editor, {'sqlite': SQLITE_CREATE, 'postgresql': POSTGRESQL_CREATE})
+
+
+def drop_search_index(apps, schema_editor):
+    _run(schema_editor, {'sqlite': SQLITE_DROP, 'postgresql': POSTGRESQL_DROP})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('casts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
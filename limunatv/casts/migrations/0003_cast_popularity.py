@@ -0,0 +1,18 @@
+# Generated by Django 6.1.2 on 2026-10-19 05:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('casts', '0002_cast_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cast',
+            name='popularity',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
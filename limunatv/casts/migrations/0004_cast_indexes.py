@@ -0,0 +1,35 @@
+# Generated by Django 6.1.2 on 2026-10-19 05:41
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('casts', '0003_cast_popularity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cast',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='cast',
+            index=models.Index(fields=['name'], name='casts_cast_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cast',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='casts_cast_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cast',
+            index=models.Index(fields=['-popularity', 'name'], name='casts_cast_popularity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cast',
+            index=models.Index(fields=['updated_at'], name='casts_cast_updated_at_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.1.2 on 2026-10-19 05:43
+
+import casts.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('casts', '0004_cast_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='cast',
+            name='photo',
+            field=models.ImageField(blank=True, null=True, storage=casts.models.photo_storage, upload_to='casts/photos/'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.1.2 on 2026-10-19 05:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('casts', '0005_cast_photo_storage'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='cast',
+            name='casts_cast_name_idx',
+        ),
+        migrations.AddIndex(
+            model_name='cast',
+            index=models.Index(fields=['name', 'id'], name='casts_cast_name_id_idx'),
+        ),
+    ]
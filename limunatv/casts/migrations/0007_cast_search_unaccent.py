@@ -0,0 +1,52 @@
+from django.db import migrations
+
+# unaccent() is only STABLE (its dictionary can change), so PostgreSQL will not
+# index it directly. The wrapper pins the dictionary and is declared
+# IMMUTABLE, which is the documented way to use it in index expressions.
+POSTGRESQL_CREATE = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    "CREATE OR REPLACE FUNCTION casts_unaccent(text) RETURNS text AS "
+    "$$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$ "
+    "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT",
+    "DROP INDEX IF EXISTS casts_cast_name_tsv",
+    "DROP INDEX IF EXISTS casts_cast_name_trgm",
+    "CREATE INDEX casts_cast_name_tsv "
+    "ON casts_cast USING GIN (to_tsvector('simple', casts_unaccent(name)))",
+    "CREATE INDEX casts_cast_name_trgm "
+    "ON casts_cast USING GIN (casts_unaccent(name) gin_trgm_ops)",
+]
+POSTGRESQL_DROP = [
+    "DROP INDEX IF EXISTS casts_cast_name_tsv",
+    "DROP INDEX IF EXISTS casts_cast_name_trgm",
+    "CREATE INDEX casts_cast_name_tsv "
+    "ON casts_cast USING GIN (to_tsvector('simple', name))",
+    "CREATE INDEX casts_cast_name_trgm "
+    "ON casts_cast USING GIN (name gin_trgm_ops)",
+    "DROP FUNCTION IF EXISTS casts_unaccent(text)",
+]
+
+
+def _run(schema_editor, statements):
+    # SQLite's FTS5 tokenizer already removes diacritics (migration 0002).
+    if schema_editor.connection.vendor == 'postgresql':
+        for sql in statements:
+            schema_editor.execute(sql)
+
+
+def unaccent_search_index(apps, schema_editor):
+    _run(schema_editor, POSTGRESQL_CREATE)
+
+
+def plain_search_index(apps, schema_editor):
+    _run(schema_editor, POSTGRESQL_DROP)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('casts', '0006_cast_name_id_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(unaccent_search_index, plain_search_index),
+    ]
@@ -1,9 +1,50 @@
+from django.core.files.storage import storages
 from django.db import models
+from django.db.models import Case, CharField, Q, Value, When
+from django.db.models.functions import Concat, Lower
+
+
+def photo_storage():
+    """Content-addressed storage for cast photos (``STORAGES['photos']``)."""
+    return storages['photos']
+
+
+def catalog_queryset():
+    """All casts in case-insensitive name order, as served by the catalog.
+
+    ``photo_url`` is built in SQL so rows can be encoded without touching
+    Python; publish it under ``photo`` (see ``CATALOG_FIELDS``).
+    """
+    return Cast.objects.order_by(Lower('name')).annotate(
+        photo_url=Case(
+            When(Q(photo='') | Q(photo__isnull=True), then=Value(None)),
+            default=Concat(Value(photo_storage().base_url), 'photo'),
+            output_field=CharField(),
+        ),
+    )
+
+
+# (queryset field, published name) pairs for catalog_queryset() rows.
+CATALOG_FIELDS = (('id', 'id'), ('name', 'name'), ('popularity', 'popularity'), ('photo_url', 'photo'))
 
 
 class Cast(models.Model):
     name = models.CharField(max_length=255)
-    photo = models.ImageField(upload_to='casts/photos/', blank=True, null=True)
+    photo = models.ImageField(upload_to='casts/photos/', storage=photo_storage, blank=True, null=True)
+    # Higher scores rank first in autocomplete suggestions.
+    popularity = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # Keep casts/query_plans.py in sync: every registered hot query must
+        # be served by one of these indexes.
+        indexes = [
+            # (name, id) is the admin changelist's total order.
+            models.Index(fields=['name', 'id'], name='casts_cast_name_id_idx'),
+            models.Index(Lower('name'), name='casts_cast_name_lower_idx'),
+            models.Index(fields=['-popularity', 'name'], name='casts_cast_popularity_idx'),
+            models.Index(fields=['updated_at'], name='casts_cast_updated_at_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -0,0 +1,58 @@
+"""
+Registry of the app's hot queries, checked by ``manage.py check_query_plans``.
+
+Register a function of the database alias that returns the queryset built
+by the production code itself, not a copy of it, so a change to the real
+query is checked too. The command asks the database for each plan and
+fails if any of them falls back to a full table scan or an on-the-fly sort.
+Pass ``allow=('sort',)`` for a query expected to sort a small, already
+filtered result (search matches); a table scan still fails it.
+"""
+
+from django.contrib import admin
+
+from .admin import CastAdmin
+from .autocomplete import PrefixIndex
+from .models import Cast, catalog_queryset
+from .snapshots import fingerprint_queryset
+
+HOT_QUERIES = {}
+
+
+def register(label, allow=()):
+    def decorator(fn):
+        HOT_QUERIES[label] = (fn, frozenset(allow))
+        return fn
+    return decorator
+
+
+def _admin_changelist(using):
+    return Cast.objects.using(using).order_by(*CastAdmin.ordering)
+
+
+@register('catalog (case-insensitive name order)')
+def catalog(using):
+    return catalog_queryset().using(using)[:100]
+
+
+@register('autocomplete index load')
+def autocomplete_load(using):
+    return PrefixIndex().load_queryset(using)
+
+
+@register('snapshot fingerprint')
+def snapshot_fingerprint(using):
+    return fingerprint_queryset(using)
+
+
+@register('admin changelist')
+def admin_changelist(using):
+    return _admin_changelist(using)[:100]
+
+
+# Matches come from the full-text index and are then sorted by name.
+@register('admin full-text search', allow=('sort',))
+def admin_search(using):
+    model_admin = CastAdmin(Cast, admin.site)
+    queryset, _ = model_admin.get_search_results(None, _admin_changelist(using), 'tom ha')
+    return queryset[:100]
@@ -0,0 +1,154 @@
+"""
+Full-text search over cast names.
+
+On SQLite the names are mirrored into an FTS5 virtual table
+(``casts_cast_fts``) that is kept in sync with ``casts_cast`` by triggers.
+The table uses the ``unicode61`` tokenizer with diacritics removed, so
+"Zoe" finds "Zoë", and keeps prefix indexes so as-you-type queries do not
+scan the whole term list.
+
+On PostgreSQL the same API is served from a ``tsvector`` expression index
+with a trigram index as the fuzzy fallback. Both index ``casts_unaccent(name)``
+(an immutable wrapper around ``unaccent``, see migration 0007) and queries go
+through the same function, so accents are ignored there too. Any other
+backend falls back to ``icontains``.
+"""
+
+import re
+
+from django.db import connections, router
+from django.db.models.expressions import RawSQL
+
+from .models import Cast
+
+# Raw SQL in this module interpolates only this constant; user input is
+# always passed as a query parameter (hence the ``nosec`` markers).
+FTS_TABLE = 'casts_cast_fts'
+
+# Same statements as migration 0002, which keeps its own copy.
+_SQLITE_TRIGGERS = {
+    'casts_cast_fts_ai': (
+        f"CREATE TRIGGER IF NOT EXISTS casts_cast_fts_ai AFTER INSERT ON casts_cast BEGIN "  # nosec B608
+        f"INSERT INTO {FTS_TABLE}(rowid, name) VALUES (new.id, new.name); END"
+    ),
+    'casts_cast_fts_ad': (
+        f"CREATE TRIGGER IF NOT EXISTS casts_cast_fts_ad AFTER DELETE ON casts_cast BEGIN "  # nosec B608
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name) VALUES ('delete', old.id, old.name); END"
+    ),
+    'casts_cast_fts_au': (
+        f"CREATE TRIGGER IF NOT EXISTS casts_cast_fts_au AFTER UPDATE OF name ON casts_cast BEGIN "  # nosec B608
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name) VALUES ('delete', old.id, old.name); "
+        f"INSERT INTO {FTS_TABLE}(rowid, name) VALUES (new.id, new.name); END"
+    ),
+}
+
+# Written exactly like the expressions of the indexes in migration 0007, so
+# PostgreSQL can use them.
+_PG_MATCH = (
+    "to_tsvector('simple', casts_unaccent(name)) @@ to_tsquery('simple', casts_unaccent(%s)) "
+    "OR casts_unaccent(name) %% casts_unaccent(%s)"
+)
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _tokens(query):
+    return _TOKEN_RE.findall(query or '')[:8]
+
+
+def ensure_search_index(using='default'):
+    """Recreate SQLite sync triggers that a table rebuild dropped.
+
+    SQLite migrations that alter ``casts_cast`` copy it into a new table and
+    drop the old one, taking the triggers with it. This runs after every
+    ``migrate`` and restores them, rebuilding the index if any were missing.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name LIKE %s",
+            [f'{FTS_TABLE}%'],
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        if FTS_TABLE not in existing or existing.issuperset(_SQLITE_TRIGGERS):
+            return
+        for sql in _SQLITE_TRIGGERS.values():
+            cursor.execute(sql)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")  # nosec B608
+
+
+def fts_query(query):
+    """Turn free text into an FTS5 MATCH expression with prefix matching.
+
+    Every token is quoted (so user input can never inject FTS operators) and
+    the last one is treated as a prefix, e.g. ``tom ha`` -> ``"tom" "ha"*``.
+    """
+    tokens = _tokens(query)
+    if not tokens:
+        return ''
+    quoted = [f'"{token}"' for token in tokens]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def _tsquery(query):
+    tokens = _tokens(query)
+    if not tokens:
+        return ''
+    return ' & '.join(f'{token}:*' for token in tokens)
+
+
+def filter_queryset(queryset, query, using=None):
+    """Restrict ``queryset`` to casts matching ``query`` (unordered)."""
+    vendor = connections[using or queryset.db].vendor
+    if vendor == 'sqlite':
+        match = fts_query(query)
+        if not match:
+            return queryset
+        return queryset.filter(id__in=RawSQL(  # nosec B611
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]  # nosec B608
+        ))
+    if vendor == 'postgresql':
+        tsquery = _tsquery(query)
+        if not tsquery:
+            return queryset
+        return queryset.filter(id__in=RawSQL(  # nosec B611
+            f"SELECT id FROM casts_cast WHERE {_PG_MATCH}", [tsquery, query],  # nosec B608
+        ))
+    return queryset.filter(name__icontains=query)
+
+
+def search_casts(query, limit=20, using=None):
+    """Return up to ``limit`` casts matching ``query``, best matches first.
+
+    Without ``using`` the database routers pick the connection, so API
+    searches can be served by a read replica.
+    """
+    using = using or router.db_for_read(Cast)
+    vendor = connections[using].vendor
+    if vendor == 'sqlite':
+        match = fts_query(query)
+        if not match:
+            return []
+        return list(Cast.objects.using(using).raw(
+            f"SELECT c.* FROM {FTS_TABLE} "  # nosec B608
+            f"JOIN casts_cast c ON c.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s ORDER BY {FTS_TABLE}.rank LIMIT %s",
+            [match, limit],
+        ))
+    if vendor == 'postgresql':
+        tsquery = _tsquery(query)
+        if not tsquery:
+            return []
+        return list(Cast.objects.using(using).raw(
+            f"SELECT * FROM casts_cast WHERE {_PG_MATCH} "  # nosec B608
+            "ORDER BY ts_rank(to_tsvector('simple', casts_unaccent(name)), "
+            "to_tsquery('simple', casts_unaccent(%s))) DESC, "
+            "similarity(casts_unaccent(name), casts_unaccent(%s)) DESC LIMIT %s",
+            [tsquery, query, tsquery, query, limit],
+        ))
+    if not query.strip():
+        return []
+    return list(Cast.objects.using(using).filter(name__icontains=query).order_by('name')[:limit])
@@ -0,0 +1,330 @@
+"""
+Precomputed catalog snapshots served as static files.
+
+``build_snapshot`` renders the catalog into ``CASTS_SNAPSHOT_ROOT`` (by
+default ``STATIC_ROOT/catalog``) in the ``?format=rows`` layout of
+``/api/casts/``:
+
+* ``all.<hash>.json``, the full catalog in the same order as the API;
+* ``<key>.<hash>.json`` per first letter (``a`` ... ``z``, accents folded,
+  and ``_`` for everything else), so a client can fetch one shard;
+* ``manifest.json``, naming the current files.
+
+File names carry a hash of their content, so each file is immutable and can
+be cached forever. Brotli and gzip variants sit next to every file. The
+version is the hash of ``all``. ``/api/casts/snapshot/`` publishes the
+manifest, and clients refetch only when the version changes.
+
+Rebuilds are incremental. Nothing is done while the catalog's fingerprint
+(row count, last ``updated_at``, highest id) is unchanged. When it has
+changed, only shards whose content differs are written and compressed
+again. Saving or deleting a ``Cast`` schedules a rebuild after
+``CASTS_SNAPSHOT_DEBOUNCE_SECONDS``.
+
+The fingerprint only notices an update that moves ``updated_at``. ``save()``
+does that through ``auto_now``, but ``QuerySet.update()`` and
+``bulk_update()`` do not, so every bulk writer must set ``updated_at``
+itself, as the admin actions, ``import_casts`` and ``migrate_media`` do.
+Writes that follow this rule but send no signals are picked up by
+:func:`refresh_snapshot` or ``manage.py build_catalog_snapshot --watch``;
+anything else needs ``--force``.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Value
+from django.utils import timezone
+
+from limunatv.fastjson import dumps, loads
+
+from .autocomplete import normalize
+from .models import CATALOG_FIELDS, Cast, catalog_queryset
+
+try:
+    import fcntl
+except ImportError:  # Windows: rebuilds are not serialized across processes
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = 'manifest.json'
+SHARD_KEYS = tuple('abcdefghijklmnopqrstuvwxyz') + ('_',)
+# mkstemp() creates files readable by the owner only.
+FILE_MODE = 0o644
+
+
+def snapshot_root():
+    return str(getattr(settings, 'CASTS_SNAPSHOT_ROOT', os.path.join(settings.STATIC_ROOT, 'catalog')))
+
+
+def snapshot_url():
+    """URL prefix of the snapshot files; ``STATIC_URL`` + ``catalog/`` by default.
+
+    Works with a relative, absolute or CDN ``STATIC_URL``.
+    """
+    return getattr(settings, 'CASTS_SNAPSHOT_URL', None) or urljoin(settings.STATIC_URL, 'catalog/')
+
+
+def shard_key(name):
+    """``'Émile Zola'`` -> ``'e'``; names not starting with a-z go to ``'_'``."""
+    first = normalize(name)[:1]
+    return first if 'a' <= first <= 'z' else '_'
+
+
+def fingerprint_queryset(using='default'):
+    """One row of ``(count, last updated_at, highest id)`` for the whole table.
+
+    Grouping by a constant makes this a single aggregate row, as
+    ``aggregate()`` would, but as a queryset that ``check_query_plans`` can
+    EXPLAIN.
+    """
+    return (
+        Cast.objects.using(using).order_by()
+        .annotate(table=Value(1)).values('table')
+        .annotate(count=Count('id'), last_update=Max('updated_at'), last_id=Max('id'))
+        .values_list('count', 'last_update', 'last_id')
+    )
+
+
+def fingerprint(using='default'):
+    """A cheap summary of the table that changes whenever the catalog does.
+
+    Relies on writers moving ``updated_at`` (see the module docstring).
+    """
+    count, last_update, last_id = fingerprint_queryset(using).get()
+    return [count, last_update.isoformat() if last_update else None, last_id]
+
+
+_manifest_cache = {'mtime': None, 'manifest': None}
+
+
+def read_manifest():
+    """Return the current manifest, or ``None`` before the first build."""
+    path = os.path.join(snapshot_root(), MANIFEST)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if _manifest_cache['mtime'] != mtime:
+        with open(path, 'rb') as fh:
+            _manifest_cache['manifest'] = loads(fh.read())
+        _manifest_cache['mtime'] = mtime
+    return _manifest_cache['manifest']
+
+
+class _ArrayFile:
+    """Writes ``{"fields": [...], "results": [...]}`` to a temporary file."""
+
+    def __init__(self, directory, head):
+        fd, self.path = tempfile.mkstemp(dir=directory, prefix='.snapshot-')
+        self.file = os.fdopen(fd, 'wb')
+        self.digest = hashlib.sha256()
+        self.count = 0
+        self._write(head)
+
+    def _write(self, data):
+        self.file.write(data)
+        self.digest.update(data)
+
+    def add(self, rows):
+        self._write((b',' if self.count else b'') + dumps(rows)[1:-1])
+        self.count += len(rows)
+
+    def finish(self, directory, key):
+        """Close the file and move it to ``<key>.<hash>.json``; returns that name."""
+        self._write(b']}')
+        self.file.close()
+        name = f'{key}.{self.digest.hexdigest()[:12]}.json'
+        final_path = os.path.join(directory, name)
+        if os.path.exists(final_path):
+            os.remove(self.path)  # unchanged since the last build
+            return name, False
+        os.chmod(self.path, FILE_MODE)
+        os.replace(self.path, final_path)
+        _compress(final_path)
+        return name, True
+
+    def discard(self):
+        self.file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _compress(path):
+    from whitenoise.compress import Compressor
+
+    Compressor(quiet=True).compress(path)
+
+
+def _write_manifest(directory, manifest):
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.manifest-')
+    with os.fdopen(fd, 'wb') as fh:
+        fh.write(dumps(manifest))
+    os.chmod(temp_path, FILE_MODE)
+    os.replace(temp_path, os.path.join(directory, MANIFEST))
+
+
+def _retire(directory, keep, retired, retain_seconds):
+    """Split superseded snapshot files into those to keep and those to delete.
+
+    ``retired`` maps each file no longer in the manifest to the time it left
+    it, as recorded by earlier builds. Old versions stay for
+    ``retain_seconds`` after that, so clients that just read the previous
+    manifest can still fetch its files. Returns ``(retired, expired)``: the
+    updated map and the names now due for deletion.
+    """
+    now = time.time()
+    on_disk = {
+        entry.name.removesuffix('.br').removesuffix('.gz')
+        for entry in os.scandir(directory) if entry.name not in (MANIFEST, '.lock')
+    }
+    # Files first seen now (just replaced, or left by an older build) start their time now.
+    retired = {name: retired.get(name, now) for name in on_disk - keep}
+    expired = {name for name, retired_at in retired.items() if now - retired_at >= retain_seconds}
+    return {name: at for name, at in retired.items() if name not in expired}, expired
+
+
+def _delete(directory, names):
+    """Delete each of ``names`` together with its compressed variants."""
+    for name in names:
+        for suffix in ('', '.br', '.gz'):
+            try:
+                os.remove(os.path.join(directory, name + suffix))
+            except FileNotFoundError:
+                pass
+
+
+def _locked(directory):
+    lock = open(os.path.join(directory, '.lock'), 'a')
+    if fcntl is not None:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+    return lock
+
+
+def build_snapshot(force=False, using='default', retain_seconds=None):
+    """Bring the snapshot up to date; returns ``(manifest, shards_written)``.
+
+    ``shards_written`` is ``None`` when the catalog had not changed and
+    nothing was rebuilt.
+    """
+    directory = snapshot_root()
+    os.makedirs(directory, exist_ok=True)
+    if retain_seconds is None:
+        retain_seconds = getattr(settings, 'CASTS_SNAPSHOT_RETAIN_SECONDS', 3600)
+
+    with _locked(directory):
+        current = read_manifest()
+        source = fingerprint(using)
+        if current is not None and not force and current.get('fingerprint') == source:
+            return current, None
+
+        fields, names = zip(*CATALOG_FIELDS)
+        head = b'{"fields":' + dumps(names) + b',"results":['
+        everything = _ArrayFile(directory, head)
+        shards = {key: _ArrayFile(directory, head) for key in SHARD_KEYS}
+        name_index = fields.index('name')
+        try:
+            rows = catalog_queryset().using(using).values_list(*fields).iterator(chunk_size=2000)
+            chunk = []
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) >= 2000:
+                    _add_chunk(chunk, everything, shards, name_index)
+                    chunk = []
+            if chunk:
+                _add_chunk(chunk, everything, shards, name_index)
+        except BaseException:
+            everything.discard()
+            for shard in shards.values():
+                shard.discard()
+            raise
+
+        all_name, _ = everything.finish(directory, 'all')
+        written = 0
+        manifest_shards = {}
+        for key, shard in shards.items():
+            name, new = shard.finish(directory, key)
+            written += new
+            manifest_shards[key] = {'url': snapshot_url() + name, 'count': shard.count}
+
+        manifest = {
+            'version': all_name.split('.')[1],
+            'generated_at': timezone.now().isoformat(),
+            'count': everything.count,
+            'fields': list(names),
+            'all': snapshot_url() + all_name,
+            'shards': manifest_shards,
+            'fingerprint': source,
+        }
+        keep = {all_name, *(entry['url'].rsplit('/', 1)[1] for entry in manifest_shards.values())}
+        previous = current.get('retired', {}) if current else {}
+        manifest['retired'], expired = _retire(directory, keep, previous, retain_seconds)
+        _write_manifest(directory, manifest)
+        _delete(directory, expired)
+        return manifest, written
+
+
+def _add_chunk(chunk, everything, shards, name_index):
+    everything.add(chunk)
+    grouped = {}
+    for row in chunk:
+        grouped.setdefault(shard_key(row[name_index]), []).append(row)
+    for key, rows in grouped.items():
+        shards[key].add(rows)
+
+
+_timer_lock = threading.Lock()
+_timer = None
+
+
+def _rebuild_in_background():
+    global _timer
+    from django.db import connections
+
+    with _timer_lock:
+        _timer = None
+    try:
+        build_snapshot()
+    except Exception:
+        logger.exception('Catalog snapshot rebuild failed')
+    finally:
+        connections.close_all()
+
+
+def schedule_rebuild():
+    """Rebuild the snapshot shortly, coalescing bursts of changes into one build.
+
+    Does nothing until a snapshot has been built once (``manage.py
+    build_catalog_snapshot``), so development databases never grow one.
+    """
+    global _timer
+    if read_manifest() is None:
+        return
+    delay = getattr(settings, 'CASTS_SNAPSHOT_DEBOUNCE_SECONDS', 5)
+    with _timer_lock:
+        if _timer is None:
+            _timer = threading.Timer(delay, _rebuild_in_background)
+            _timer.daemon = True
+            _timer.start()
+
+
+def refresh_snapshot():
+    """Bring an existing snapshot up to date now.
+
+    For management commands that write in bulk: the timer behind
+    :func:`schedule_rebuild` would die with their process.
+    """
+    if read_manifest() is not None:
+        build_snapshot()
+
+
+def cast_changed(sender, instance, **kwargs):
+    transaction.on_commit(schedule_rebuild)
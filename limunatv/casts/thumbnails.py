@@ -0,0 +1,107 @@
+"""
+Small derivatives of cast photos for the admin changelist.
+
+A thumbnail is a pure function of its source photo's bytes, so it is stored
+next to the photos under a name built from the photo's content hash:
+``casts/photos/ab/cd/<sha256>.jpg`` gets
+``casts/thumbs/96/ab/cd/<sha256>.jpg``. Like the photo's own URL, that name
+never changes meaning and is served as immutable. Photos that are not yet
+content-addressed (run ``manage.py migrate_media``) get no thumbnail.
+
+Decoding a photo is too slow for a request, so thumbnails are never made
+while a page renders: the changelist only shows ones that exist. A saved
+cast gets its thumbnail from a background thread once the save commits;
+``import_casts`` and ``migrate_media`` render them for the photos they
+write; ``manage.py build_thumbnails`` fills in any that are missing.
+"""
+
+import io
+import logging
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+
+from limunatv.storage import CONTENT_ADDRESSED_RE
+
+from .models import photo_storage
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_DIR = 'casts/thumbs'
+# Rendered at twice the admin's 48px display size for high-DPI screens.
+THUMBNAIL_SIZE = 96
+
+
+def thumbnail_name(photo_name, size=THUMBNAIL_SIZE):
+    """Return the thumbnail name for a content-addressed photo, else ``None``."""
+    if not photo_name or not CONTENT_ADDRESSED_RE.search(photo_name):
+        return None
+    digest = posixpath.splitext(posixpath.basename(photo_name))[0]
+    return f'{THUMBNAIL_DIR}/{size}/{digest[:2]}/{digest[2:4]}/{digest}.jpg'
+
+
+def render_thumbnail(fh, size=THUMBNAIL_SIZE):
+    """Return JPEG bytes of the image in ``fh`` scaled to fit ``size`` x ``size``."""
+    from PIL import Image, ImageOps
+
+    with Image.open(fh) as image:
+        # Let the JPEG decoder skip straight to a reduced scale.
+        image.draft('RGB', (size, size))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((size, size))
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        buffer = io.BytesIO()
+        image.save(buffer, 'JPEG', quality=80, optimize=True)
+    return buffer.getvalue()
+
+
+def existing_thumbnail(photo_name, size=THUMBNAIL_SIZE):
+    """Return the thumbnail name for ``photo_name`` if it has been rendered."""
+    name = thumbnail_name(photo_name, size)
+    if name is None or not photo_storage().exists(name):
+        return None
+    return name
+
+
+def ensure_thumbnail(photo_name, size=THUMBNAIL_SIZE):
+    """Return the thumbnail name for ``photo_name``, rendering it if missing.
+
+    Returns ``None`` when there is no thumbnail to show: the photo is not
+    content-addressed, is missing, or is not a readable image.
+    """
+    name = thumbnail_name(photo_name, size)
+    if name is None:
+        return None
+    storage = photo_storage()
+    if storage.exists(name):
+        return name
+    try:
+        with storage.open(photo_name, 'rb') as fh:
+            data = render_thumbnail(fh, size)
+    except Exception:
+        logger.warning('Could not render a thumbnail for %s', photo_name, exc_info=True)
+        return None
+    return storage.save_derived(name, ContentFile(data))
+
+
+_executor_lock = threading.Lock()
+_executor = None
+
+
+def schedule_thumbnail(photo_name):
+    """Render the thumbnail for ``photo_name`` in a background thread."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='thumbnails')
+    _executor.submit(ensure_thumbnail, photo_name)
+
+
+def cast_saved(sender, instance, using, **kwargs):
+    if instance.photo and thumbnail_name(instance.photo.name):
+        transaction.on_commit(partial(schedule_thumbnail, instance.photo.name), using=using)
@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path('', views.cast_list, name='cast-list'),
+    path('search/', views.cast_search, name='cast-search'),
+    path('autocomplete/', views.cast_autocomplete, name='cast-autocomplete'),
+    path('snapshot/', views.cast_snapshot, name='cast-snapshot'),
+]
@@ -0,0 +1,134 @@
+import os
+import re
+
+from django.http import Http404
+from django.views.decorators.http import require_http_methods
+from django.views.static import serve
+
+from limunatv.fastjson import FastJsonResponse, streaming_json_response
+from limunatv.middleware import parse_accept_encoding
+
+from .autocomplete import get_index
+from .models import CATALOG_FIELDS, catalog_queryset, photo_storage
+from .search import search_casts
+from .snapshots import read_manifest, snapshot_root
+
+MAX_SEARCH_RESULTS = 50
+MAX_SUGGESTIONS = 20
+
+# Snapshot files are named <key>.<12 hex digits>.json and never change.
+SNAPSHOT_FILE_RE = re.compile(r'^[a-z_]+\.[0-9a-f]{12}\.json$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def _limit(request, default, maximum):
+    try:
+        return max(1, min(int(request.GET.get('limit', default)), maximum))
+    except ValueError:
+        return default
+
+
+def _photo_url(name):
+    return photo_storage().url(name) if name else None
+
+
+def _cast_json(cast):
+    return {
+        'id': cast.id,
+        'name': cast.name,
+        'photo': _photo_url(cast.photo.name),
+    }
+
+
+@require_http_methods(["GET"])
+def cast_list(request):
+    """
+    The full cast catalog in case-insensitive name order.
+
+    Streams ``{"results": [{"id", "name", "popularity", "photo"}, ...]}``.
+    With ``?format=rows`` the body is ``{"fields": [...], "results": [[...]]}``
+    instead, which is smaller and several times cheaper to encode.
+    """
+    fields, names = zip(*CATALOG_FIELDS)
+    return streaming_json_response(
+        catalog_queryset(),
+        fields,
+        names=names,
+        as_rows=request.GET.get('format') == 'rows',
+    )
+
+
+@require_http_methods(["GET"])
+def cast_search(request):
+    """
+    Ranked full-text search over cast names.
+
+    Usage: /api/casts/search/?q=tom+ha&limit=20
+    The last word is matched as a prefix and accents are ignored.
+    """
+    query = request.GET.get('q', '').strip()
+    limit = _limit(request, 20, MAX_SEARCH_RESULTS)
+    results = search_casts(query, limit=limit) if query else []
+    return FastJsonResponse({
+        'query': query,
+        'count': len(results),
+        'results': [_cast_json(cast) for cast in results],
+    })
+
+
+@require_http_methods(["GET"])
+def cast_autocomplete(request):
+    """
+    As-you-type name suggestions served from the in-memory prefix index.
+
+    Usage: /api/casts/autocomplete/?q=tom&limit=10
+    Never queries the database; results are ordered by popularity.
+    """
+    query = request.GET.get('q', '')
+    limit = _limit(request, 10, MAX_SUGGESTIONS)
+    suggestions = get_index().suggest(query, limit=limit)
+    return FastJsonResponse({
+        'query': query,
+        'results': [{'id': cast_id, 'name': name} for cast_id, name in suggestions],
+    })
+
+
+@require_http_methods(["GET"])
+def cast_snapshot(request):
+    """
+    The current catalog snapshot: its version and the URLs of its files.
+
+    ``all`` holds the whole catalog and ``shards`` one file per first
+    letter, in the ``?format=rows`` layout of ``/api/casts/``. The files are
+    static and immutable, so clients poll this endpoint and refetch only
+    when ``version`` changes. Returns 404 until ``manage.py
+    build_catalog_snapshot`` has run.
+    """
+    manifest = read_manifest()
+    if manifest is None:
+        return FastJsonResponse({'error': 'No catalog snapshot has been built.'}, status=404)
+    response = FastJsonResponse({k: v for k, v in manifest.items() if k not in ('fingerprint', 'retired')})
+    response['Cache-Control'] = 'public, max-age=10'
+    return response
+
+
+def snapshot_file(request, path):
+    """Serve a snapshot file WhiteNoise does not know about yet.
+
+    WhiteNoise indexes STATIC_ROOT when the worker starts, so versions built
+    afterwards reach this view until the next restart. The precompressed
+    variant is sent when the client accepts it.
+    """
+    if not SNAPSHOT_FILE_RE.match(path):
+        raise Http404(path)
+    root = snapshot_root()
+    accepted = parse_accept_encoding(request.headers.get('Accept-Encoding', ''))
+    wildcard = accepted.get('*', 0.0)
+    for suffix, encoding in (('.br', 'br'), ('.gz', 'gzip')):
+        if accepted.get(encoding, wildcard) > 0 and os.path.exists(os.path.join(root, path + suffix)):
+            path += suffix
+            break
+    response = serve(request, path, document_root=root)
+    response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    response['Vary'] = 'Accept-Encoding'
+    return response
@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+
+
+class LimunatvConfig(AppConfig):
+    """Project-level hooks and management commands (not tied to one app)."""
+
+    name = 'limunatv'
+    verbose_name = 'LuminaTV'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from .auth_backends import connect_signals
+        from .db_router import install_error_tracking
+
+        connect_signals()
+        connection_created.connect(install_error_tracking, dispatch_uid='replica-error-tracking')
@@ -14,3 +14,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'limunatv.settings')
 
 application = get_asgi_application()
+
+# Build the autocomplete prefix index before the first keystroke arrives.
+from casts.autocomplete import warm_index  # noqa: E402
+warm_index()
@@ -0,0 +1,48 @@
+"""
+Authentication backend that caches user lookups.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+class CachedModelBackend(ModelBackend):
+    """``ModelBackend`` whose per-request ``get_user`` is served from the cache.
+
+    Every authenticated request (admin pages, mostly) otherwise costs a
+    ``SELECT`` on ``auth_user``. Cached users are dropped whenever a user is
+    saved or deleted (see ``invalidate_cached_user``), so password changes
+    still log other sessions out and deactivations apply immediately.
+    Entries also expire after ``AUTH_USER_CACHE_TIMEOUT`` seconds.
+
+    Only use it with a cache shared by every worker (settings enable it when
+    one is configured). With a per-process cache the invalidation reaches
+    only the worker that saved the user.
+    """
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 60))
+        return user
+
+
+def invalidate_cached_user(sender, instance, **kwargs):
+    cache.delete(user_cache_key(instance.pk))
+
+
+def connect_signals():
+    from django.db.models.signals import post_delete, post_save
+
+    User = get_user_model()
+    post_save.connect(invalidate_cached_user, sender=User, dispatch_uid='auth-user-cache-save')
+    post_delete.connect(invalidate_cached_user, sender=User, dispatch_uid='auth-user-cache-delete')
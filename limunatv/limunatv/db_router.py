@@ -0,0 +1,152 @@
+"""
+Database router that sends API reads to read replicas.
+
+Replica aliases are listed in ``DATABASE_REPLICAS``. ``ReplicaRoutingMiddleware``
+marks each request as eligible for replica reads (GET/HEAD requests under
+``DATABASE_REPLICA_PATH_PREFIXES``), and the router then serves that request's
+reads from one replica. Everything else, and every write, uses ``default``.
+
+Reads go back to the primary:
+
+* for the rest of a request once it has written anything;
+* for ``DATABASE_REPLICA_LAG_SECONDS`` after a write, via a short-lived cookie
+  set by the middleware, so a client reads its own writes even while the
+  replicas catch up (API paths have no session to keep this in);
+* while a replica is unhealthy: a replica that cannot be connected to, or
+  whose query fails, is skipped for ``DATABASE_REPLICA_RETRY_SECONDS``.
+
+The replica is picked and its connection checked when the request starts,
+before the view runs. Streamed responses (``/api/casts/``) query after the
+middleware has returned, so they are never the first to find a replica
+down. A query that fails on a replica still fails its request, since it
+cannot be replayed once a response may have started; the replica is then
+taken out of rotation and the rest of the request reads from the primary.
+"""
+
+import contextvars
+import logging
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+_unhealthy_lock = threading.Lock()
+_unhealthy = {}  # alias -> time.monotonic() after which it is retried
+
+# Per-request routing state. It is replaced at the start of every request and
+# deliberately not reset at the end, because streamed responses run their
+# queries after the middleware has returned.
+_request_state = contextvars.ContextVar('db_routing_state', default=None)
+
+
+class RoutingState:
+    __slots__ = ('replica_reads', 'wrote', 'alias')
+
+    def __init__(self, replica_reads):
+        self.replica_reads = replica_reads
+        self.wrote = False
+        self.alias = None
+
+
+def replica_aliases():
+    return tuple(getattr(settings, 'DATABASE_REPLICAS', ()))
+
+
+def begin_request(replica_reads):
+    """Start routing a new request; returns its :class:`RoutingState`.
+
+    For replica-eligible requests the replica is chosen (and its connection
+    checked) here, so failures fall back to the primary up front.
+    """
+    state = RoutingState(replica_reads)
+    if replica_reads:
+        state.alias = choose_replica()
+    _request_state.set(state)
+    return state
+
+
+def current_state():
+    return _request_state.get()
+
+
+def mark_unhealthy(alias):
+    retry = getattr(settings, 'DATABASE_REPLICA_RETRY_SECONDS', 30)
+    logger.warning('Read replica %s unavailable; using the primary for %ss', alias, retry)
+    with _unhealthy_lock:
+        _unhealthy[alias] = time.monotonic() + retry
+
+
+def choose_replica():
+    """Return a connectable replica alias, or ``default`` if there is none."""
+    now = time.monotonic()
+    with _unhealthy_lock:
+        candidates = [alias for alias in replica_aliases() if _unhealthy.get(alias, 0) <= now]
+    random.shuffle(candidates)  # nosec B311 - load spreading, not security
+    for alias in candidates:
+        connection = connections[alias]
+        try:
+            connection.ensure_connection()
+            usable = connection.is_usable()  # catches connections dropped since the last request
+        except DatabaseError:
+            usable = False
+        if usable:
+            return alias
+        mark_unhealthy(alias)
+        connection.close_if_unusable_or_obsolete()
+    return DEFAULT_DB_ALIAS
+
+
+def _track_errors(execute, sql, params, many, context):
+    """Execute wrapper on replica connections: a failing query takes the replica out."""
+    try:
+        return execute(sql, params, many, context)
+    except DatabaseError:
+        alias = context['connection'].alias
+        mark_unhealthy(alias)
+        state = _request_state.get()
+        if state is not None and state.alias == alias:
+            state.alias = DEFAULT_DB_ALIAS
+        raise
+
+
+def install_error_tracking(sender, connection, **kwargs):
+    """``connection_created`` receiver that wraps replica connections."""
+    if connection.alias in replica_aliases() and _track_errors not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_track_errors)
+
+
+class ReplicaRouter:
+    """Route reads of replica-eligible requests to ``DATABASE_REPLICAS``."""
+
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        if state is None or not state.replica_reads or state.wrote:
+            return None
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        if state.alias is None:
+            state.alias = choose_replica()
+        return state.alias
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replica_aliases():
+            return False
+        return None
@@ -0,0 +1,102 @@
+"""
+JSON encoding for API responses.
+
+Uses ``orjson`` when it is installed and falls back to the stdlib ``json``
+module otherwise; both produce compact UTF-8 bytes.
+
+Large lists of model rows go through :func:`streaming_json_response`, which
+encodes ``values_list()`` rows a chunk at a time (one encoder call per chunk,
+not per row) and streams the chunks so the full payload is never held in
+memory. In the compact ``rows`` layout the tuples are encoded directly as
+JSON arrays with no per-row dict at all; with orjson that is roughly ten
+times faster than encoding the same rows as objects
+(see ``benchmarks/bench_json.py``).
+"""
+
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, StreamingHttpResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_django_encoder = DjangoJSONEncoder()
+
+if orjson is not None:
+    BACKEND = 'orjson'
+
+    def dumps(obj):
+        """Serialize ``obj`` to compact JSON bytes."""
+        return orjson.dumps(obj, default=_django_encoder.default)
+
+    loads = orjson.loads
+else:
+    BACKEND = 'json'
+    _stdlib_encoder = DjangoJSONEncoder(separators=(',', ':'), ensure_ascii=False)
+
+    def dumps(obj):
+        """Serialize ``obj`` to compact JSON bytes."""
+        return _stdlib_encoder.encode(obj).encode('utf-8')
+
+    loads = json.loads
+
+
+class FastJsonResponse(HttpResponse):
+    """Drop-in replacement for ``JsonResponse`` that encodes with :func:`dumps`."""
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=dumps(data), **kwargs)
+
+
+def _encode_objects(fields):
+    def encode(chunk):
+        return dumps([dict(zip(fields, row)) for row in chunk])[1:-1]
+    return encode
+
+
+def _encode_rows(chunk):
+    return dumps(chunk)[1:-1]
+
+
+def iter_json_array(rows, encode_chunk, head=b'[', tail=b']', chunk_size=500):
+    """Yield ``head``, the rows in comma-joined chunks, then ``tail``.
+
+    ``encode_chunk`` takes a list of rows and returns their JSON encodings
+    joined by commas (a JSON array without its brackets).
+    """
+    yield head
+    chunk, first = [], True
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield encode_chunk(chunk) if first else b',' + encode_chunk(chunk)
+            chunk, first = [], False
+    if chunk:
+        yield encode_chunk(chunk) if first else b',' + encode_chunk(chunk)
+    yield tail
+
+
+def streaming_json_response(queryset, fields, names=None, key='results', as_rows=False,
+                            chunk_size=500, **kwargs):
+    """Stream ``queryset.values_list(*fields)`` as JSON.
+
+    By default the body is ``{"<key>": [{"field": value, ...}, ...]}``. With
+    ``as_rows=True`` it is ``{"fields": [...], "<key>": [[value, ...], ...]}``,
+    which skips building a dict per row. ``names`` overrides the output key
+    for each field, e.g. to publish an annotation under a model field's name.
+    """
+    names = tuple(names or fields)
+    rows = queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+    if as_rows:
+        head = b'{"fields":' + dumps(names) + b',' + dumps(key) + b':['
+        encode_chunk = _encode_rows
+    else:
+        head = b'{' + dumps(key) + b':['
+        encode_chunk = _encode_objects(names)
+    body = iter_json_array(rows, encode_chunk, head=head, tail=b']}', chunk_size=chunk_size)
+    kwargs.setdefault('content_type', 'application/json')
+    return StreamingHttpResponse(body, **kwargs)
@@ -0,0 +1,45 @@
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete expired database sessions in small batches, so the purge never holds '
+        'a long write lock on django_session.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Sessions deleted per statement (default: 1000).')
+        parser.add_argument('--sleep', type=float, default=0.05,
+                            help='Seconds to pause between batches (default: 0.05).')
+
+    def handle(self, *args, **options):
+        if settings.SESSION_ENGINE.endswith('signed_cookies'):
+            self.stdout.write('Signed-cookie sessions are not stored server-side; nothing to purge.')
+            return
+
+        batch_size = max(1, options['batch_size'])
+        now = timezone.now()
+        started = time.perf_counter()
+        total = 0
+        while True:
+            pks = list(
+                Session.objects.filter(expire_date__lt=now)
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+            deleted, _ = Session.objects.filter(pk__in=pks).delete()
+            total += deleted
+            if len(pks) < batch_size:
+                break
+            time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Purged {total:,} expired sessions in {time.perf_counter() - started:.1f}s'
+        ))
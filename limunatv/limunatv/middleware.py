@@ -0,0 +1,290 @@
+"""
+Project middleware.
+"""
+
+import hashlib
+import zlib
+
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.cache import caches
+from django.utils.cache import patch_vary_headers
+
+from . import db_router
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    zstd = None
+    try:
+        import zstandard
+    except ImportError:
+        zstandard = None
+
+
+class _Gzip:
+    name = 'gzip'
+
+    def compress(self, data):
+        return zlib.compress(data, 6, wbits=31)
+
+    def stream(self):
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        return (
+            lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH),
+            compressor.flush,
+        )
+
+
+class _Brotli:
+    name = 'br'
+
+    def compress(self, data):
+        return brotli.compress(data, quality=5)
+
+    def stream(self):
+        compressor = brotli.Compressor(quality=5)
+        return (
+            lambda chunk: compressor.process(chunk) + compressor.flush(),
+            compressor.finish,
+        )
+
+
+class _Zstd:
+    name = 'zstd'
+
+    def compress(self, data):
+        if zstd is not None:
+            return zstd.compress(data, level=3)
+        return zstandard.ZstdCompressor(level=3).compress(data)
+
+    def stream(self):
+        if zstd is not None:
+            compressor = zstd.ZstdCompressor(level=3)
+            return (
+                lambda chunk: compressor.compress(chunk, mode=zstd.ZstdCompressor.FLUSH_BLOCK),
+                lambda: compressor.flush(mode=zstd.ZstdCompressor.FLUSH_FRAME),
+            )
+        compressor = zstandard.ZstdCompressor(level=3).compressobj()
+        return (
+            lambda chunk: compressor.compress(chunk) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+            compressor.flush,
+        )
+
+
+# Server preference order; codings whose library isn't installed are skipped.
+ENCODERS = [
+    encoder for encoder, available in (
+        (_Brotli(), brotli is not None),
+        (_Zstd(), zstd is not None or zstandard is not None),
+        (_Gzip(), True),
+    ) if available
+]
+
+
+def parse_accept_encoding(header):
+    """Return ``{coding: q}`` for an Accept-Encoding header."""
+    accepted = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoder(header):
+    """Pick the most preferred encoder the client accepts, or ``None``."""
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get('*', 0.0)
+    for encoder in ENCODERS:
+        if accepted.get(encoder.name, wildcard) > 0:
+            return encoder
+    return None
+
+
+class CompressionMiddleware:
+    """Compress dynamic responses with Brotli, zstd or gzip.
+
+    The coding is negotiated from ``Accept-Encoding`` (server preference:
+    br, zstd, gzip). Bodies smaller than ``COMPRESS_MIN_SIZE`` and content
+    types outside ``COMPRESS_CONTENT_TYPES`` are sent as-is; HTML is left out
+    by default so pages carrying CSRF tokens stay clear of BREACH-style
+    attacks. Streaming responses are compressed chunk by chunk and flushed
+    after each chunk, so clients still receive data incrementally.
+
+    Compressed bodies of at least ``COMPRESS_CACHE_MIN_SIZE`` bytes are
+    cached under their content hash in ``COMPRESS_CACHE_ALIAS``, so an
+    identical payload (e.g. the same catalog page) is compressed once.
+
+    Place it after WhiteNoise, which serves its own precompressed files.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, 'COMPRESS_MIN_SIZE', 512)
+        self.content_types = tuple(getattr(settings, 'COMPRESS_CONTENT_TYPES', (
+            'application/json', 'text/plain', 'text/css', 'text/csv',
+            'application/javascript', 'text/javascript', 'application/xml', 'image/svg+xml',
+        )))
+        self.cache_min_size = getattr(settings, 'COMPRESS_CACHE_MIN_SIZE', 4096)
+        self.cache_alias = getattr(settings, 'COMPRESS_CACHE_ALIAS', 'default')
+        self.cache_timeout = getattr(settings, 'COMPRESS_CACHE_TIMEOUT', 300)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if response.has_header('Content-Encoding') or response.status_code == 206:
+            return response
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if not content_type.startswith(self.content_types):
+            return response
+        encoder = choose_encoder(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if encoder is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                return response
+            compress_chunk, finish = encoder.stream()
+
+            def compressed_stream(chunks=response.streaming_content):
+                for chunk in chunks:
+                    data = compress_chunk(chunk)
+                    if data:
+                        yield data
+                yield finish()
+
+            response.streaming_content = compressed_stream()
+            del response.headers['Content-Length']
+        else:
+            if len(response.content) < self.min_size:
+                return response
+            compressed = self._compress(encoder, response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # The compressed body is a different representation; keep ETags weak.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoder.name
+        return response
+
+    def _compress(self, encoder, content):
+        if len(content) < self.cache_min_size:
+            return encoder.compress(content)
+        cache = caches[self.cache_alias]
+        key = f'compressed:{encoder.name}:{hashlib.blake2b(content, digest_size=20).hexdigest()}'
+        compressed = cache.get(key)
+        if compressed is None:
+            compressed = encoder.compress(content)
+            cache.set(key, compressed, self.cache_timeout)
+        return compressed
+
+
+def is_stateless_path(path):
+    """True for URL prefixes in ``STATELESS_PATH_PREFIXES`` (API, probes, CSP)."""
+    return path.startswith(tuple(getattr(settings, 'STATELESS_PATH_PREFIXES', ())))
+
+
+class StatelessSessionMiddleware(SessionMiddleware):
+    """``SessionMiddleware`` that does nothing for stateless paths.
+
+    API clients and probes never use the session, so no session store is
+    created and no session cookie is read or set for them.
+    """
+
+    def process_request(self, request):
+        if not is_stateless_path(request.path_info):
+            super().process_request(request)
+
+    def process_response(self, request, response):
+        if not hasattr(request, 'session'):
+            return response
+        return super().process_response(request, response)
+
+
+async def _anonymous_auser():
+    return AnonymousUser()
+
+
+class StatelessAuthenticationMiddleware(AuthenticationMiddleware):
+    """``AuthenticationMiddleware`` that treats stateless paths as anonymous."""
+
+    def process_request(self, request):
+        if is_stateless_path(request.path_info):
+            request.user = AnonymousUser()
+            request.auser = _anonymous_auser
+            return
+        super().process_request(request)
+
+
+class StatelessMessageMiddleware(MessageMiddleware):
+    """``MessageMiddleware`` that skips message storage on stateless paths."""
+
+    def process_request(self, request):
+        if not is_stateless_path(request.path_info):
+            super().process_request(request)
+
+
+class ReplicaRoutingMiddleware:
+    """Mark requests whose reads may be served by a read replica.
+
+    Safe (GET/HEAD) requests under ``DATABASE_REPLICA_PATH_PREFIXES`` read
+    from ``DATABASE_REPLICAS`` unless the client wrote recently. Any request
+    that writes gets a ``DATABASE_REPLICA_PIN_COOKIE`` cookie lasting
+    ``DATABASE_REPLICA_LAG_SECONDS``, which keeps that client's reads on the
+    primary until the replicas have caught up. The replica is chosen and
+    checked before the view runs, so an unreachable one falls back to the
+    primary even for streamed responses.
+
+    See ``limunatv.db_router``. Does nothing when no replicas are configured.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = bool(db_router.replica_aliases())
+        self.prefixes = tuple(getattr(settings, 'DATABASE_REPLICA_PATH_PREFIXES', ('/api/',)))
+        self.cookie_name = getattr(settings, 'DATABASE_REPLICA_PIN_COOKIE', 'db_primary')
+        self.lag_seconds = getattr(settings, 'DATABASE_REPLICA_LAG_SECONDS', 5)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+        state = db_router.begin_request(
+            request.method in ('GET', 'HEAD')
+            and request.path_info.startswith(self.prefixes)
+            and self.cookie_name not in request.COOKIES
+        )
+        response = self.get_response(request)
+        if state.wrote:
+            response.set_cookie(
+                self.cookie_name, '1',
+                max_age=self.lag_seconds,
+                secure=request.is_secure(),
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
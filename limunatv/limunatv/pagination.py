@@ -0,0 +1,71 @@
+"""
+Paginators for large tables.
+"""
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max
+from django.utils.functional import cached_property
+
+
+def estimate_row_count(model, using='default'):
+    """Return a cheap estimate of the number of rows in ``model``'s table, or ``None``.
+
+    PostgreSQL keeps one in ``pg_class.reltuples``; SQLite has one in
+    ``sqlite_stat1`` once ``ANALYZE`` has run (``manage.py analyze_db``, part
+    of the build). Until then the highest integer primary key stands in,
+    read from the primary key index. All of these lag behind writes or
+    overcount after deletes, so the result is only good for display.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    estimate = None
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+            row = cursor.fetchone()
+            estimate = row[0] if row else None
+        elif connection.vendor == 'sqlite':
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            if cursor.fetchone():
+                cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table])
+                row = cursor.fetchone()
+                estimate = int(row[0].split()[0]) if row else None
+    # PostgreSQL reports -1 (or 0) before the first ANALYZE or autovacuum.
+    if estimate is None or estimate <= 0:
+        estimate = _max_pk(model, using)
+    return estimate if estimate and estimate > 0 else None
+
+
+def _max_pk(model, using):
+    if model._meta.pk.get_internal_type() not in ('AutoField', 'BigAutoField', 'SmallAutoField'):
+        return None
+    return model._default_manager.using(using).aggregate(top=Max('pk'))['top']
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that avoids ``COUNT(*)`` over large result sets.
+
+    For an unfiltered queryset of a table larger than ``exact_count_limit``
+    rows a cheap estimate (see ``estimate_row_count``) is used. Filtered
+    querysets (admin searches and list filters) are counted only up to
+    ``exact_count_limit``, so a broad search pages through at most that many
+    results. Pages past the end of an overestimate simply come back empty.
+
+    Pair it with ``ModelAdmin.show_full_result_count = False``, otherwise the
+    changelist runs its own full count as well.
+    """
+
+    exact_count_limit = 10_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query'):
+            return super().count
+        if not queryset.query.has_filters():
+            estimate = estimate_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > self.exact_count_limit:
+                return estimate
+            return queryset.count()
+        return queryset.order_by()[:self.exact_count_limit].count()
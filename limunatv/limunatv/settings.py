@@ -112,6 +112,9 @@ except ImportError:
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Always use WhiteNoise for serving static files
+    # br/zstd/gzip for dynamic responses; below WhiteNoise so static files,
+    # which are already precompressed, never pass through it.
+    'limunatv.middleware.CompressionMiddleware',
 ]
 
 # Add CORS middleware early if available
@@ -121,13 +124,16 @@ try:
 except ImportError:
     pass
 
-# Add remaining core middleware
+# Add remaining core middleware. Session, auth and messages are skipped for
+# STATELESS_PATH_PREFIXES (see limunatv.middleware). Replica routing goes first
+# so writes made by any later middleware still pin the client to the primary.
 MIDDLEWARE.extend([
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'limunatv.middleware.ReplicaRoutingMiddleware',
+    'limunatv.middleware.StatelessSessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'limunatv.middleware.StatelessAuthenticationMiddleware',
+    'limunatv.middleware.StatelessMessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ])
 
@@ -168,6 +174,74 @@ DATABASES = {
     }
 }
 
+# Read replicas: GET/HEAD requests under DATABASE_REPLICA_PATH_PREFIXES read
+# from the DATABASES aliases in DATABASE_REPLICAS; writes and all other
+# requests use 'default' (see limunatv.db_router). After a write the client
+# reads from the primary for DATABASE_REPLICA_LAG_SECONDS; a failing replica
+# is skipped for DATABASE_REPLICA_RETRY_SECONDS.
+#
+# DJANGO_DB_SQLITE_READ_REPLICA=1 adds a read-only (mode=ro) connection to the
+# SQLite file as the 'replica' alias, which keeps read traffic from ever taking
+# write locks. DJANGO_DB_SQLITE_IMMUTABLE=1 also sets immutable=1 so SQLite
+# skips locking and change detection altogether; only set it when nothing
+# writes to the file while the app runs (e.g. a baked, read-only catalog).
+DATABASE_REPLICAS = []
+if os.environ.get('DJANGO_DB_SQLITE_READ_REPLICA', 'False').lower() in ('true', '1', 'yes'):
+    _replica_uri = Path(DATABASES['default']['NAME']).resolve().as_uri() + '?mode=ro'
+    if os.environ.get('DJANGO_DB_SQLITE_IMMUTABLE', 'False').lower() in ('true', '1', 'yes'):
+        _replica_uri += '&immutable=1'
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': _replica_uri,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append('replica')
+DATABASE_ROUTERS = ['limunatv.db_router.ReplicaRouter']
+DATABASE_REPLICA_PATH_PREFIXES = ('/api/',)
+DATABASE_REPLICA_LAG_SECONDS = int(os.environ.get('DATABASE_REPLICA_LAG_SECONDS', '5'))
+DATABASE_REPLICA_RETRY_SECONDS = int(os.environ.get('DATABASE_REPLICA_RETRY_SECONDS', '30'))
+
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Set REDIS_URL to share the cache (sessions, users, compressed bodies)
+# between workers; otherwise each process keeps its own in-memory cache.
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Sessions and user lookups are cached only when the cache is shared. With a
+# per-process cache, a logout, password change or deactivation would clear
+# the entry only in the worker that handled it, and the other workers would
+# keep honouring the old session until it expired. Set
+# DJANGO_SESSION_ENGINE=django.contrib.sessions.backends.signed_cookies to keep
+# sessions entirely client-side. API, health and CSP paths never load a session.
+SHARED_CACHE = bool(os.environ.get('REDIS_URL'))
+SESSION_ENGINE = os.environ.get(
+    'DJANGO_SESSION_ENGINE',
+    'django.contrib.sessions.backends.cached_db' if SHARED_CACHE else 'django.contrib.sessions.backends.db',
+)
+STATELESS_PATH_PREFIXES = ('/api/', '/health/', '/status/', '/csp-report/')
+
+# With a shared cache, authenticated requests look the user up there before
+# querying auth_user.
+if SHARED_CACHE:
+    AUTHENTICATION_BACKENDS = ['limunatv.auth_backends.CachedModelBackend']
+else:
+    AUTHENTICATION_BACKENDS = ['django.contrib.auth.backends.ModelBackend']
+AUTH_USER_CACHE_TIMEOUT = int(os.environ.get('AUTH_USER_CACHE_TIMEOUT', '60'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -209,15 +283,68 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 # Media files (for user-uploaded images such as Cast photos)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Serve MEDIA_ROOT from Django (always on in DEBUG). Enable on hosts without a
+# separate media server, e.g. Render with the persistent disk.
+SERVE_MEDIA = DEBUG or os.environ.get('DJANGO_SERVE_MEDIA', 'False').lower() in ('true', '1', 'yes')
 
 # Local apps
+INSTALLED_APPS.append('limunatv.apps.LimunatvConfig')
 INSTALLED_APPS.append('casts.apps.CastsConfig')
 
+# Autocomplete: each worker keeps up to this many of the most popular casts in
+# an in-memory prefix index and rebuilds it at this interval (seconds).
+CASTS_AUTOCOMPLETE_MAX_ENTRIES = int(os.environ.get('CASTS_AUTOCOMPLETE_MAX_ENTRIES', '50000'))
+CASTS_AUTOCOMPLETE_REFRESH_SECONDS = int(os.environ.get('CASTS_AUTOCOMPLETE_REFRESH_SECONDS', '300'))
+
+# Catalog snapshots (casts.snapshots): precompressed JSON files of the whole
+# catalog under STATIC_ROOT/catalog/, served from STATIC_URL + 'catalog/'
+# (CASTS_SNAPSHOT_URL overrides it) and rebuilt this many seconds after a
+# cast changes. Superseded files are deleted RETAIN_SECONDS after a rebuild
+# replaced them.
+CASTS_SNAPSHOT_ROOT = STATIC_ROOT / 'catalog'
+CASTS_SNAPSHOT_DEBOUNCE_SECONDS = int(os.environ.get('CASTS_SNAPSHOT_DEBOUNCE_SECONDS', '5'))
+CASTS_SNAPSHOT_RETAIN_SECONDS = int(os.environ.get('CASTS_SNAPSHOT_RETAIN_SECONDS', '3600'))
+
+# Static files are stored under content-hashed names with Brotli and gzip
+# variants written by collectstatic, so WhiteNoise can serve them precompressed
+# with far-future immutable caching. Compression runs on this many threads and
+# skips files whose variants are already up to date.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'limunatv.storage.ParallelCompressedManifestStorage',
+    },
+    # Cast photos are named by content hash: identical uploads are stored
+    # once and every URL can be cached as immutable.
+    'photos': {
+        'BACKEND': 'limunatv.storage.ContentAddressedStorage',
+    },
+}
+STATIC_COMPRESS_WORKERS = int(os.environ.get('STATIC_COMPRESS_WORKERS', '0')) or None
+
 # WhiteNoise configuration for serving static files
 WHITENOISE_AUTOREFRESH = DEBUG
 WHITENOISE_USE_FINDERS = DEBUG
-WHITENOISE_COMPRESS_OFFLINE = not DEBUG
-WHITENOISE_COMPRESS_LEVEL = 9 if not DEBUG else 6
+# Hash files missing from the manifest on demand instead of raising. Outside
+# DEBUG, templates still need `collectstatic` to have run.
+WHITENOISE_MANIFEST_STRICT = False
+# Anything named <name>.<12 hex digits>.<ext> never changes: collectstatic's
+# hashed files and the catalog snapshot files.
+WHITENOISE_IMMUTABLE_FILE_TEST = r'\.[0-9a-f]{12}\.[^./]+$'
+
+# Health checks: readiness results are reused for this many seconds and
+# refreshed in the background afterwards. Disk checks fail below the threshold.
+HEALTH_CHECK_CACHE_TTL = int(os.environ.get('HEALTH_CHECK_CACHE_TTL', '10'))
+HEALTH_CHECK_MIN_DISK_FREE_MB = int(os.environ.get('HEALTH_CHECK_MIN_DISK_FREE_MB', '100'))
+
+# Dynamic response compression (limunatv.middleware.CompressionMiddleware).
+# Bodies below COMPRESS_MIN_SIZE bytes are sent uncompressed; compressed
+# bodies from COMPRESS_CACHE_MIN_SIZE bytes up are cached by content hash.
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', '512'))
+COMPRESS_CACHE_MIN_SIZE = int(os.environ.get('COMPRESS_CACHE_MIN_SIZE', '4096'))
+COMPRESS_CACHE_TIMEOUT = int(os.environ.get('COMPRESS_CACHE_TIMEOUT', '300'))
 
 # ------------------ Security hardening defaults ------------------
 # Cookie security (disabled in DEBUG for easier development)
@@ -0,0 +1,148 @@
+"""
+Storage backends for the LuminaTV project.
+"""
+
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+# Matches names produced by ContentAddressedStorage: <dir>/ab/cd/<sha256>.<ext>
+CONTENT_ADDRESSED_RE = re.compile(r'(^|/)([0-9a-f]{2})/([0-9a-f]{2})/\2\3[0-9a-f]{60}(\.\w+)?$')
+
+
+class ParallelCompressedManifestStorage(CompressedManifestStaticFilesStorage):
+    """Hashed static files with Brotli/gzip variants, compressed in parallel.
+
+    Variants left by a previous ``collectstatic`` are reused instead of being
+    compressed again: for hashed names the content cannot have changed, and
+    for other files WhiteNoise stamps each ``.br``/``.gz`` with its source's
+    mtime, so a matching mtime means the variant is current.
+    Hashed names (``app.3f2a9c1b4d5e.css``) let WhiteNoise serve the files
+    with ``Cache-Control: immutable``.
+    """
+
+    _hashed_name_re = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+
+    def _existing_variants(self, path):
+        full_path = self.path(path)
+        try:
+            mtime = os.stat(full_path).st_mtime
+        except FileNotFoundError:
+            return None
+        hashed = bool(self._hashed_name_re.search(path))
+        variants = []
+        for suffix in ('.br', '.gz'):
+            try:
+                if os.stat(full_path + suffix).st_mtime != mtime and not hashed:
+                    return None
+            except FileNotFoundError:
+                if suffix == '.br' and self.compressor.use_brotli:
+                    return None
+                continue
+            variants.append(path + suffix)
+        return variants or None
+
+    def _compress_path(self, path):
+        variants = self._existing_variants(path)
+        if variants is not None:
+            return path, variants
+        full_path = self.path(path)
+        prefix_len = len(full_path) - len(path)
+        return path, [compressed[prefix_len:] for compressed in self.compressor.compress(full_path)]
+
+    def compress_files(self, paths):
+        extensions = getattr(settings, 'WHITENOISE_SKIP_COMPRESS_EXTENSIONS', None)
+        self.compressor = self.create_compressor(extensions=extensions, quiet=True)
+        workers = getattr(settings, 'STATIC_COMPRESS_WORKERS', None) or os.cpu_count() or 1
+        to_compress = sorted(path for path in paths if self.compressor.should_compress(path))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for path, compressed_names in executor.map(self._compress_path, to_compress):
+                for compressed_name in compressed_names:
+                    yield path, compressed_name
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Media storage that names every file after the SHA-256 of its content.
+
+    ``casts/photos/tom.jpg`` is stored as
+    ``casts/photos/ab/cd/abcd...<64 hex>.jpg``. Uploads are hashed while they
+    are streamed to a temporary file, so large files are never held in
+    memory. If the same bytes are uploaded again, the existing file is reused
+    and no second copy is written. Because a name always refers to the same
+    bytes, URLs can be cached forever (see ``views_media.serve_media``).
+
+    Several rows may share one file, so files are never deleted when a row is
+    deleted; ``manage.py migrate_media --reclaim`` removes unreferenced ones.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is derived from the content in _save(), so there is
+        # nothing to de-conflict here.
+        return name
+
+    def _save(self, name, content):
+        directory = posixpath.dirname(name)
+        extension = posixpath.splitext(name)[1].lower()
+        os.makedirs(self.location, exist_ok=True)
+
+        digest = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=self.location, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    temp_file.write(chunk)
+
+            hexdigest = digest.hexdigest()
+            final_name = posixpath.join(directory, hexdigest[:2], hexdigest[2:4], hexdigest + extension)
+            final_path = self.path(final_name)
+            try:
+                # Reuse identical content that is already stored, touching it
+                # so `migrate_media --reclaim` (which spares recently modified
+                # files) cannot delete it before the new row is saved.
+                os.utime(final_path)
+            except FileNotFoundError:
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                os.replace(temp_path, final_path)
+                if self.file_permissions_mode is not None:
+                    os.chmod(final_path, self.file_permissions_mode)
+            else:
+                os.remove(temp_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return final_name
+
+    def save_derived(self, name, content):
+        """Store ``content`` under exactly ``name``, bypassing content addressing.
+
+        For files computed deterministically from a content-addressed source,
+        such as thumbnails: their name embeds the source's hash, so it is just
+        as immutable. Concurrent writers produce identical bytes, and the
+        atomic replace makes that race harmless.
+        """
+        final_path = self.path(name)
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(final_path), prefix='.derived-')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                for chunk in content.chunks():
+                    temp_file.write(chunk)
+            os.replace(temp_path, final_path)
+            if self.file_permissions_mode is not None:
+                os.chmod(final_path, self.file_permissions_mode)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return name
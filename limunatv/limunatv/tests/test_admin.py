@@ -0,0 +1,42 @@
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from casts.models import Cast
+
+from .test_stateless import PLAIN_STATIC
+
+CHANGELIST = '/admin/casts/cast/'
+
+
+@override_settings(STORAGES=PLAIN_STATIC)
+class BulkDeleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_superuser('staff', 'staff@example.com', 'pw')
+        Cast.objects.bulk_create(Cast(name=f'Cast {i}') for i in range(150))
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def post(self, **data):
+        first = Cast.objects.order_by('pk').first()
+        data = {'action': 'delete_selected', ACTION_CHECKBOX_NAME: [first.pk], **data}
+        return self.client.post(CHANGELIST, data, secure=True)
+
+    def test_select_across_confirmation_posts_one_pk(self):
+        response = self.post(select_across='1')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '150 casts')
+        self.assertContains(response, 'name="select_across" value="1"')
+        self.assertContains(response, f'name="{ACTION_CHECKBOX_NAME}"', count=1)
+
+    def test_select_across_confirmed_deletes_everything(self):
+        response = self.post(select_across='1', post='yes')
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Cast.objects.exists())
+
+    def test_small_selection_lists_the_objects(self):
+        response = self.post()
+        self.assertContains(response, 'Cast 0')
+        self.assertNotContains(response, 'name="select_across"')
@@ -0,0 +1,97 @@
+from unittest import mock
+
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase
+
+from casts import autocomplete
+from casts.autocomplete import PrefixIndex
+from casts.models import Cast
+
+
+def names(index, prefix, limit=10):
+    return [name for _pk, name in index.suggest(prefix, limit)]
+
+
+class PrefixIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = PrefixIndex()
+        self.index.build([
+            (1, 'Tom Hanks', 50),
+            (2, 'Tom Holland', 80),
+            (3, 'Zoë Saldaña', 60),
+            (4, 'Tina Fey', 50),
+        ])
+
+    def test_suggestions_by_popularity_then_name(self):
+        self.assertEqual(names(self.index, 't'), ['Tom Holland', 'Tina Fey', 'Tom Hanks'])
+        self.assertEqual(names(self.index, 'tom h', limit=1), ['Tom Holland'])
+
+    def test_later_words_and_accents_match(self):
+        self.assertEqual(names(self.index, 'hanks'), ['Tom Hanks'])
+        self.assertEqual(names(self.index, 'SALDANA'), ['Zoë Saldaña'])
+        self.assertEqual(names(self.index, 'zoe'), ['Zoë Saldaña'])
+
+    def test_build_keeps_at_most_max_entries(self):
+        index = PrefixIndex(max_entries=2)
+        index.build([(1, 'A', 3), (2, 'B', 2), (3, 'C', 1)])
+        self.assertEqual(len(index), 2)
+
+    def test_short_prefix_memo_is_dropped_on_change(self):
+        self.assertEqual(names(self.index, 'ti'), ['Tina Fey'])
+        self.index.upsert(5, 'Tim Robbins', 90)
+        self.assertEqual(names(self.index, 'ti'), ['Tim Robbins', 'Tina Fey'])
+        self.index.upsert(5, 'Bob Robbins', 90)
+        self.assertEqual(names(self.index, 'ti'), ['Tina Fey'])
+        self.index.remove(4)
+        self.assertEqual(names(self.index, 'ti'), [])
+
+    def test_full_index_evicts_the_least_popular(self):
+        index = PrefixIndex(max_entries=2)
+        index.build([(1, 'Ann', 1), (2, 'Bob', 5)])
+        # Ann's old popularity is left behind in the heap; eviction must skip it.
+        index.upsert(1, 'Ann', 10)
+        index.upsert(3, 'Cid', 7)
+        self.assertEqual(names(index, 'a') + names(index, 'b') + names(index, 'c'), ['Ann', 'Cid'])
+
+        index.upsert(4, 'Dee', 2)  # less popular than everything indexed
+        self.assertEqual(names(index, 'd'), [])
+        self.assertEqual(len(index), 2)
+
+    def test_stale_heap_pairs_are_compacted(self):
+        index = PrefixIndex(max_entries=2)
+        index.build([(1, 'Ann', 1), (2, 'Bob', 5)])
+        for popularity in range(2, 50):
+            index.upsert(1, 'Ann', popularity)
+        index.upsert(3, 'Cid', 100)
+        self.assertLessEqual(len(index._heap), 2 * len(index))
+        self.assertEqual(names(index, 'b'), [])
+
+
+class SignalTests(TestCase):
+    def setUp(self):
+        self.index = PrefixIndex()
+        self.index.build([])
+        patcher = mock.patch.object(autocomplete, 'index', self.index)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_rolled_back_save_is_not_indexed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    Cast.objects.create(name='Ghost')
+                    raise RuntimeError('rollback')
+            except RuntimeError:
+                pass
+            self.assertEqual(names(self.index, 'ghost'), [])
+        self.assertEqual(names(self.index, 'ghost'), [])
+
+    def test_committed_save_and_delete_are_applied(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            cast = Cast.objects.create(name='Real', popularity=3)
+            self.assertEqual(names(self.index, 'real'), [])
+        self.assertEqual(names(self.index, 'real'), ['Real'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            cast.delete()
+        self.assertEqual(names(self.index, 'real'), [])
@@ -0,0 +1,106 @@
+import gzip
+import unittest
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from limunatv.middleware import CompressionMiddleware, brotli, choose_encoder, parse_accept_encoding
+
+BODY = b'{"results":[' + b','.join(b'{"id":%d,"name":"Cast %d"}' % (i, i) for i in range(200)) + b']}'
+
+
+def json_response(body=BODY, **headers):
+    response = HttpResponse(body, content_type='application/json')
+    for name, value in headers.items():
+        response.headers[name] = value
+    return response
+
+
+class AcceptEncodingTests(SimpleTestCase):
+    def test_parse_q_values(self):
+        self.assertEqual(
+            parse_accept_encoding('gzip;q=0.5, br, identity; q=0, *;q=bogus'),
+            {'gzip': 0.5, 'br': 1.0, 'identity': 0.0, '*': 0.0},
+        )
+
+    def test_parse_empty_header(self):
+        self.assertEqual(parse_accept_encoding(''), {})
+
+    def test_choose_prefers_server_order(self):
+        expected = 'br' if brotli is not None else 'gzip'
+        self.assertEqual(choose_encoder('gzip, br').name, expected)
+
+    def test_q_zero_excludes_coding(self):
+        self.assertEqual(choose_encoder('br;q=0, zstd;q=0, gzip').name, 'gzip')
+        self.assertIsNone(choose_encoder('gzip;q=0'))
+
+    def test_wildcard(self):
+        self.assertIsNotNone(choose_encoder('*'))
+        self.assertIsNone(choose_encoder('*, br;q=0, zstd;q=0, gzip;q=0'))
+        self.assertIsNone(choose_encoder('identity'))
+
+
+@override_settings(COMPRESS_MIN_SIZE=512, COMPRESS_CACHE_MIN_SIZE=10**9)
+class CompressionMiddlewareTests(SimpleTestCase):
+    def process(self, response, accept='gzip'):
+        request = RequestFactory().get('/api/casts/', HTTP_ACCEPT_ENCODING=accept)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_gzip(self):
+        response = self.process(json_response())
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertEqual(gzip.decompress(response.content), BODY)
+
+    @unittest.skipIf(brotli is None, 'brotli is not installed')
+    def test_brotli(self):
+        response = self.process(json_response(), accept='br, gzip')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), BODY)
+
+    def test_below_min_size_is_left_alone(self):
+        response = self.process(json_response(b'{"ok":true}'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, b'{"ok":true}')
+
+    def test_not_accepted(self):
+        response = self.process(json_response(), accept='gzip;q=0')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+    def test_html_is_not_compressed(self):
+        response = self.process(HttpResponse(BODY, content_type='text/html'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertFalse(response.has_header('Vary'))
+
+    def test_already_encoded_and_partial_responses_pass_through(self):
+        response = self.process(json_response(**{'Content-Encoding': 'br'}))
+        self.assertEqual(response.content, BODY)
+        partial = json_response()
+        partial.status_code = 206
+        self.assertFalse(self.process(partial).has_header('Content-Encoding'))
+
+    def test_etag_is_weakened(self):
+        response = self.process(json_response(ETag='"abc"'))
+        self.assertEqual(response['ETag'], 'W/"abc"')
+        weak = self.process(json_response(ETag='W/"abc"'))
+        self.assertEqual(weak['ETag'], 'W/"abc"')
+
+    def streamed(self, accept):
+        chunks = [BODY[i:i + 1000] for i in range(0, len(BODY), 1000)]
+        response = StreamingHttpResponse(iter(chunks), content_type='application/json')
+        response = self.process(response, accept=accept)
+        self.assertFalse(response.has_header('Content-Length'))
+        return response, b''.join(response.streaming_content)
+
+    def test_streaming_gzip_round_trip(self):
+        response, body = self.streamed('gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(body), BODY)
+
+    @unittest.skipIf(brotli is None, 'brotli is not installed')
+    def test_streaming_brotli_round_trip(self):
+        response, body = self.streamed('br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(body), BODY)
@@ -0,0 +1,114 @@
+from unittest import mock
+
+from django.db import OperationalError
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from casts.models import Cast
+from limunatv import db_router
+from limunatv.db_router import ReplicaRouter
+from limunatv.middleware import ReplicaRoutingMiddleware
+
+
+class FakeConnection:
+    def __init__(self, alias, reachable=True):
+        self.alias = alias
+        self.reachable = reachable
+        self.execute_wrappers = []
+
+    def ensure_connection(self):
+        if not self.reachable:
+            raise OperationalError('replica is down')
+
+    def is_usable(self):
+        return True
+
+    def close_if_unusable_or_obsolete(self):
+        pass
+
+
+@override_settings(
+    DATABASE_REPLICAS=['replica'],
+    DATABASE_REPLICA_PATH_PREFIXES=('/api/',),
+    DATABASE_REPLICA_LAG_SECONDS=5,
+    DATABASE_REPLICA_RETRY_SECONDS=30,
+)
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        self.replica = FakeConnection('replica')
+        patcher = mock.patch.object(db_router, 'connections', {'replica': self.replica})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(db_router._unhealthy.clear)
+        self.addCleanup(db_router._request_state.set, None)
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def serve(self, request, write=False):
+        """Run ``request`` through the middleware; returns (response, read alias)."""
+        seen = {}
+
+        def view(request):
+            if write:
+                self.router.db_for_write(Cast)
+            seen['read'] = self.router.db_for_read(Cast)
+            return HttpResponse()
+
+        response = ReplicaRoutingMiddleware(view)(request)
+        return response, seen['read']
+
+    def test_api_reads_use_the_replica(self):
+        response, alias = self.serve(self.factory.get('/api/casts/'))
+        self.assertEqual(alias, 'replica')
+        self.assertNotIn('db_primary', response.cookies)
+
+    def test_other_requests_use_the_primary(self):
+        self.assertIsNone(self.serve(self.factory.post('/api/casts/'))[1])
+        self.assertIsNone(self.serve(self.factory.get('/admin/'))[1])
+
+    def test_a_write_pins_the_client_to_the_primary(self):
+        response, alias = self.serve(self.factory.get('/api/casts/'), write=True)
+        self.assertIsNone(alias)
+        cookie = response.cookies['db_primary']
+        self.assertEqual(cookie['max-age'], 5)
+        self.assertTrue(cookie['httponly'])
+
+        request = self.factory.get('/api/casts/')
+        request.COOKIES['db_primary'] = '1'
+        self.assertIsNone(self.serve(request)[1])
+
+    def test_unreachable_replica_falls_back_before_the_view_runs(self):
+        self.replica.reachable = False
+        with self.assertLogs('limunatv.db_router', 'WARNING'):
+            state = db_router.begin_request(True)
+        self.assertEqual(state.alias, 'default')
+        self.assertIn('replica', db_router._unhealthy)
+
+        # Skipped without another connection attempt until the retry time.
+        self.replica.reachable = True
+        with mock.patch.object(self.replica, 'ensure_connection') as ensure:
+            self.assertEqual(db_router.choose_replica(), 'default')
+        ensure.assert_not_called()
+
+        with mock.patch.object(db_router.time, 'monotonic', return_value=db_router._unhealthy['replica']):
+            self.assertEqual(db_router.choose_replica(), 'replica')
+
+    def test_failing_query_takes_the_replica_out(self):
+        db_router.install_error_tracking(None, self.replica)
+        db_router.install_error_tracking(None, self.replica)
+        self.assertEqual(self.replica.execute_wrappers, [db_router._track_errors])
+
+        state = db_router.begin_request(True)
+        self.assertEqual(state.alias, 'replica')
+
+        def failing_execute(sql, params, many, context):
+            raise OperationalError('disk I/O error')
+
+        with self.assertRaises(OperationalError), self.assertLogs('limunatv.db_router', 'WARNING'):
+            db_router._track_errors(failing_execute, 'SELECT 1', (), False, {'connection': self.replica})
+        self.assertIn('replica', db_router._unhealthy)
+        self.assertEqual(self.router.db_for_read(Cast), 'default')
+
+    def test_replicas_are_never_migrated(self):
+        self.assertFalse(self.router.allow_migrate('replica', 'casts'))
+        self.assertIsNone(self.router.allow_migrate('default', 'casts'))
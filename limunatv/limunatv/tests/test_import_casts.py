@@ -0,0 +1,68 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from casts.models import Cast, photo_storage
+from casts.thumbnails import existing_thumbnail
+
+from .test_thumbnails import jpeg
+
+
+class ImportCastsTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dir = directory.name
+        patcher = override_settings(MEDIA_ROOT=os.path.join(self.dir, 'media'))
+        patcher.enable()
+        self.addCleanup(patcher.disable)
+
+    def run_import(self, lines, *args):
+        path = os.path.join(self.dir, 'casts.jsonl')
+        with open(path, 'w', encoding='utf-8') as fh:
+            fh.writelines(line + '\n' for line in lines)
+        out, err = StringIO(), StringIO()
+        call_command('import_casts', path, *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_invalid_rows_are_skipped(self):
+        out, _ = self.run_import([
+            json.dumps({'name': 'Negative', 'popularity': -1}),
+            json.dumps(['not', 'an', 'object']),
+            json.dumps('Just a string'),
+            json.dumps({'name': 'Bad id', 'id': 'x'}),
+            json.dumps({'name': 42}),
+            json.dumps({'name': 'Valid', 'popularity': 3}),
+        ])
+        self.assertIn('1 created, 0 updated, 5 skipped', out)
+        self.assertEqual(list(Cast.objects.values_list('name', 'popularity')), [('Valid', 3)])
+
+    def test_failed_photo_upload_keeps_the_existing_photo(self):
+        photo = photo_storage().save('casts/photos/old.jpg', ContentFile(b'old photo'))
+        Cast.objects.bulk_create([Cast(id=901, name='Before', photo=photo)])
+
+        _, err = self.run_import(
+            [json.dumps({'id': 901, 'name': 'After', 'photo': 'missing.jpg'})],
+            '--photo-root', self.dir,
+        )
+        self.assertIn('not imported', err)
+        cast = Cast.objects.get(id=901)
+        self.assertEqual(cast.name, 'After')
+        self.assertEqual(cast.photo.name, photo)
+
+    def test_uploaded_photo_replaces_the_existing_one(self):
+        photo = photo_storage().save('casts/photos/old.jpg', ContentFile(b'old photo'))
+        Cast.objects.bulk_create([Cast(id=902, name='Before', photo=photo)])
+        with open(os.path.join(self.dir, 'new.jpg'), 'wb') as fh:
+            fh.write(jpeg())
+
+        self.run_import([json.dumps({'id': 902, 'name': 'After', 'photo': 'new.jpg'})], '--photo-root', self.dir)
+        cast = Cast.objects.get(id=902)
+        with cast.photo.open('rb') as fh:
+            self.assertEqual(fh.read(), jpeg())
+        self.assertIsNotNone(existing_thumbnail(cast.photo.name))
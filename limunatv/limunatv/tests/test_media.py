@@ -0,0 +1,73 @@
+import os
+import tempfile
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from limunatv.views_media import parse_range, serve_media
+
+PHOTO = 'casts/photos/ab/cd/abcd' + '0' * 60 + '.jpg'
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_single_ranges(self):
+        self.assertEqual(parse_range('bytes=0-9', 100), (0, 9))
+        self.assertEqual(parse_range('bytes=90-', 100), (90, 99))
+        self.assertEqual(parse_range('bytes=90-500', 100), (90, 99))
+        self.assertEqual(parse_range('bytes=-10', 100), (90, 99))
+        self.assertEqual(parse_range('bytes=-500', 100), (0, 99))
+
+    def test_ignored_headers(self):
+        for header in ('bytes=0-1,5-6', 'bytes=9-0', 'bytes=-', 'items=0-9', 'bytes=a-b'):
+            with self.subTest(header=header):
+                self.assertIsNone(parse_range(header, 100))
+
+    def test_unsatisfiable(self):
+        self.assertEqual(parse_range('bytes=100-', 100)[0], 100)
+        self.assertEqual(parse_range('bytes=-0', 100)[0], 100)
+
+
+class ServeMediaTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = override_settings(MEDIA_ROOT=directory.name)
+        patcher.enable()
+        self.addCleanup(patcher.disable)
+        self.data = bytes(range(256)) * 4
+        path = os.path.join(directory.name, PHOTO)
+        os.makedirs(os.path.dirname(path))
+        with open(path, 'wb') as fh:
+            fh.write(self.data)
+
+    def get(self, **headers):
+        response = serve_media(RequestFactory().get('/media/' + PHOTO, headers=headers), PHOTO)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_range_gets_206(self):
+        response, body = self.get(range='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, self.data[10:20])
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/1024')
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_suffix_range(self):
+        response, body = self.get(range='bytes=-24')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, self.data[-24:])
+
+    def test_unsatisfiable_range_gets_416(self):
+        response, _ = self.get(range='bytes=5000-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */1024')
+
+    def test_whole_file_without_a_usable_range(self):
+        for headers in ({}, {'range': 'bytes=0-1,5-6'}, {'range': 'bytes=0-9', 'if-range': '"x"'}):
+            with self.subTest(headers=headers):
+                response, body = self.get(**headers)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(body, self.data)
+                self.assertEqual(response['Accept-Ranges'], 'bytes')
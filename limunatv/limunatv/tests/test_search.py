@@ -0,0 +1,64 @@
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+
+from casts.models import Cast
+from casts.search import FTS_TABLE, _SQLITE_TRIGGERS, ensure_search_index, fts_query, search_casts
+
+
+def triggers():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s", [f'{FTS_TABLE}%'])
+        return {row[0] for row in cursor.fetchall()}
+
+
+def names(query):
+    return [cast.name for cast in search_casts(query)]
+
+
+class FtsQueryTests(SimpleTestCase):
+    def test_tokens_are_quoted_and_the_last_is_a_prefix(self):
+        self.assertEqual(fts_query('tom ha'), '"tom" "ha"*')
+        self.assertEqual(fts_query('tom OR "x" NEAR(y)'), '"tom" "OR" "x" "NEAR" "y"*')
+        self.assertEqual(fts_query(' -* '), '')
+
+
+@skipUnless(connection.vendor == 'sqlite', 'FTS5 index')
+class SqliteSearchTests(TestCase):
+    def test_triggers_survive_the_table_rebuilding_migrations(self):
+        self.assertEqual(triggers(), set(_SQLITE_TRIGGERS))
+
+    def test_insert_rename_and_delete_stay_in_sync(self):
+        cast = Cast.objects.create(name='Zoë Saldaña')
+        self.assertEqual(names('zoe sal'), ['Zoë Saldaña'])
+        self.assertEqual(names('SALDA'), ['Zoë Saldaña'])
+
+        cast.name = 'Tom Hanks'
+        cast.save()
+        self.assertEqual(names('zoe'), [])
+        self.assertEqual(names('tom ha'), ['Tom Hanks'])
+
+        cast.delete()
+        self.assertEqual(names('tom'), [])
+
+    def test_missing_triggers_are_restored_and_the_index_rebuilt(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER casts_cast_fts_ai')
+        Cast.objects.create(name='Added While Unindexed')
+        self.assertEqual(names('unindexed'), [])
+
+        ensure_search_index()
+        self.assertEqual(triggers(), set(_SQLITE_TRIGGERS))
+        self.assertEqual(names('unindexed'), ['Added While Unindexed'])
+
+
+@skipUnless(connection.vendor == 'sqlite', 'FTS5 index')
+class SqliteMigrationTests(TransactionTestCase):
+    def test_remigrating_keeps_search_working(self):
+        call_command('migrate', 'casts', '0003', verbosity=0)
+        call_command('migrate', verbosity=0)
+        self.assertEqual(triggers(), set(_SQLITE_TRIGGERS))
+        Cast.objects.create(name='Émile Zola')
+        self.assertEqual(names('emile'), ['Émile Zola'])
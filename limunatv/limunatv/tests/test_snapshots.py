@@ -0,0 +1,115 @@
+import os
+import tempfile
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from casts import snapshots
+from casts.models import Cast
+from casts.snapshots import build_snapshot, fingerprint, snapshot_url
+
+
+class FingerprintTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.cast = Cast.objects.create(name='Original')
+
+    def test_bulk_update_that_sets_updated_at_changes_it(self):
+        before = fingerprint()
+        self.cast.name = 'Renamed'
+        self.cast.updated_at = timezone.now()
+        Cast.objects.bulk_update([self.cast], ['name', 'updated_at'])
+        self.assertNotEqual(fingerprint(), before)
+
+    def test_empty_table(self):
+        Cast.objects.all().delete()
+        self.assertEqual(fingerprint(), [0, None, None])
+
+
+class SnapshotUrlTests(SimpleTestCase):
+    def test_follows_static_url(self):
+        for static_url, expected in [
+            ('/static/', '/static/catalog/'),
+            ('https://cdn.example.com/assets/', 'https://cdn.example.com/assets/catalog/'),
+        ]:
+            with self.subTest(static_url=static_url), override_settings(STATIC_URL=static_url):
+                self.assertEqual(snapshot_url(), expected)
+
+    @override_settings(CASTS_SNAPSHOT_URL='https://snapshots.example.com/')
+    def test_setting_overrides(self):
+        self.assertEqual(snapshot_url(), 'https://snapshots.example.com/')
+
+
+class RetentionTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = directory.name
+        patcher = override_settings(CASTS_SNAPSHOT_ROOT=self.root)
+        patcher.enable()
+        self.addCleanup(patcher.disable)
+        self.cast = Cast.objects.create(name='Original')
+
+    def rebuild(self, name, at):
+        self.cast.name = name
+        self.cast.save()
+        with mock.patch.object(snapshots.time, 'time', return_value=at):
+            return build_snapshot(retain_seconds=3600)[0]
+
+    def files(self, manifest):
+        return os.path.join(self.root, manifest['all'].rsplit('/', 1)[1])
+
+    def test_replaced_files_are_kept_from_when_they_were_replaced(self):
+        now = time.time()
+        old = self.files(self.rebuild('Original', now - 7200))
+        os.utime(old, (now - 7200, now - 7200))
+
+        manifest = self.rebuild('Renamed', now)
+        self.assertTrue(os.path.exists(old))
+        self.assertEqual(manifest['retired'][os.path.basename(old)], now)
+
+        manifest = self.rebuild('Renamed again', now + 3599)
+        self.assertTrue(os.path.exists(old))
+
+        manifest = self.rebuild('Renamed once more', now + 3600)
+        for suffix in ('', '.br', '.gz'):
+            self.assertFalse(os.path.exists(old + suffix))
+        self.assertNotIn(os.path.basename(old), manifest['retired'])
+        self.assertTrue(os.path.exists(self.files(manifest) + '.br'))
+
+    def test_retired_files_are_not_published(self):
+        self.rebuild('Original', time.time())
+        self.rebuild('Renamed', time.time())
+        response = self.client.get('/api/casts/snapshot/', secure=True)
+        self.assertNotIn('retired', response.json())
+
+
+class SnapshotFileTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = override_settings(CASTS_SNAPSHOT_ROOT=directory.name)
+        patcher.enable()
+        self.addCleanup(patcher.disable)
+        Cast.objects.create(name='A' * 2000)
+        self.url = build_snapshot()[0]['all']
+
+    def get(self, accept_encoding):
+        return self.client.get(self.url, secure=True, headers={'accept-encoding': accept_encoding})
+
+    def test_coding_follows_accept_encoding(self):
+        for header, expected in [
+            ('gzip, br', 'br'),
+            ('gzip, br;q=0', 'gzip'),
+            ('br;q=0, gzip;q=0', None),
+            ('*', 'br'),
+            ('*, br;q=0', 'gzip'),
+            ('', None),
+        ]:
+            with self.subTest(header=header):
+                response = self.get(header)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.get('Content-Encoding'), expected)
+                self.assertEqual(response['Vary'], 'Accept-Encoding')
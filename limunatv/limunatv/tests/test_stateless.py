@@ -0,0 +1,76 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from limunatv.auth_backends import CachedModelBackend, user_cache_key
+from limunatv.middleware import StatelessAuthenticationMiddleware, StatelessSessionMiddleware
+
+# Admin templates need static URLs without a collectstatic run.
+PLAIN_STATIC = dict(settings.STORAGES, staticfiles={
+    'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'})
+
+
+@override_settings(STORAGES=PLAIN_STATIC)
+class StatelessPathTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_superuser('staff', 'staff@example.com', 'pw')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_api_requests_skip_session_and_auth(self):
+        response = self.client.get('/api/casts/autocomplete/?q=a', secure=True)
+        self.assertEqual(response.status_code, 200)
+        request = response.wsgi_request
+        self.assertFalse(hasattr(request, 'session'))
+        self.assertTrue(request.user.is_anonymous)
+        self.assertNotIn('sessionid', response.cookies)
+
+    def test_health_requests_skip_session(self):
+        response = self.client.get('/health/', secure=True)
+        self.assertFalse(hasattr(response.wsgi_request, 'session'))
+
+    def test_admin_requests_keep_session_and_auth(self):
+        response = self.client.get('/admin/', secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.wsgi_request.user, self.user)
+
+    def test_deactivated_user_is_logged_out(self):
+        self.client.get('/admin/', secure=True)
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get('/admin/', secure=True)
+        self.assertEqual(response.status_code, 302)
+
+    def test_middlewares_leave_stateless_requests_untouched(self):
+        request = RequestFactory().get('/api/casts/')
+        StatelessSessionMiddleware(lambda r: HttpResponse())(request)
+        StatelessAuthenticationMiddleware(lambda r: HttpResponse())(request)
+        self.assertFalse(hasattr(request, 'session'))
+        self.assertTrue(request.user.is_anonymous)
+
+
+@override_settings(AUTHENTICATION_BACKENDS=['limunatv.auth_backends.CachedModelBackend'])
+class CachedModelBackendTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('viewer', None, 'pw')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_get_user_is_cached(self):
+        backend = CachedModelBackend()
+        self.assertEqual(backend.get_user(self.user.pk), self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(backend.get_user(self.user.pk), self.user)
+
+    def test_saving_the_user_drops_the_cached_copy(self):
+        CachedModelBackend().get_user(self.user.pk)
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+        self.assertIsNone(CachedModelBackend().get_user(self.user.pk))
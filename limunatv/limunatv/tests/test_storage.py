@@ -0,0 +1,68 @@
+import hashlib
+import os
+import stat
+import tempfile
+
+from django.core.files.base import ContentFile, File
+from django.test import SimpleTestCase
+
+from limunatv.storage import CONTENT_ADDRESSED_RE, ContentAddressedStorage
+
+
+class FailingFile(File):
+    """A file whose upload breaks off after the first chunk."""
+
+    def __init__(self):
+        super().__init__(None, name='broken.jpg')
+
+    def chunks(self, chunk_size=None):
+        yield b'first chunk'
+        raise OSError('connection reset')
+
+
+class ContentAddressedStorageTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.location = directory.name
+        self.storage = ContentAddressedStorage(location=self.location, file_permissions_mode=0o644)
+
+    def stored_files(self):
+        return sorted(
+            os.path.relpath(os.path.join(root, name), self.location)
+            for root, _dirs, names in os.walk(self.location) for name in names
+        )
+
+    def test_name_is_sharded_content_hash(self):
+        name = self.storage.save('casts/photos/Tom Hanks.JPG', ContentFile(b'photo bytes'))
+        digest = hashlib.sha256(b'photo bytes').hexdigest()
+        self.assertEqual(name, f'casts/photos/{digest[:2]}/{digest[2:4]}/{digest}.jpg')
+        self.assertRegex(name, CONTENT_ADDRESSED_RE)
+        with self.storage.open(name, 'rb') as fh:
+            self.assertEqual(fh.read(), b'photo bytes')
+        self.assertEqual(stat.S_IMODE(os.stat(self.storage.path(name)).st_mode), 0o644)
+
+    def test_identical_uploads_are_stored_once(self):
+        first = self.storage.save('casts/photos/a.jpg', ContentFile(b'same bytes'))
+        second = self.storage.save('casts/photos/b.jpg', ContentFile(b'same bytes'))
+        other = self.storage.save('casts/photos/a.jpg', ContentFile(b'other bytes'))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertEqual(self.stored_files(), sorted([first, other]))
+
+    def test_reused_file_is_touched(self):
+        name = self.storage.save('casts/photos/a.jpg', ContentFile(b'same bytes'))
+        path = self.storage.path(name)
+        os.utime(path, (1_000_000, 1_000_000))
+        self.storage.save('casts/photos/b.jpg', ContentFile(b'same bytes'))
+        self.assertGreater(os.stat(path).st_mtime, 1_000_000)
+
+    def test_failed_upload_leaves_no_temporary_file(self):
+        with self.assertRaises(OSError):
+            self.storage.save('casts/photos/broken.jpg', FailingFile())
+        self.assertEqual(self.stored_files(), [])
+
+    def test_save_derived_keeps_the_name(self):
+        name = 'casts/thumbs/96/ab/cd/abcd.jpg'
+        self.assertEqual(self.storage.save_derived(name, ContentFile(b'thumb')), name)
+        self.assertEqual(self.stored_files(), [name])
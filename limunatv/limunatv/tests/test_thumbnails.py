@@ -0,0 +1,74 @@
+import io
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from casts import thumbnails
+from casts.models import Cast, photo_storage
+from casts.thumbnails import existing_thumbnail
+
+from .test_stateless import PLAIN_STATIC
+
+
+def jpeg(size=(300, 200)):
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+@override_settings(STORAGES=PLAIN_STATIC)
+class ThumbnailTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = override_settings(MEDIA_ROOT=os.path.join(directory.name, 'media'))
+        patcher.enable()
+        self.addCleanup(patcher.disable)
+        self.photo = photo_storage().save('casts/photos/red.jpg', ContentFile(jpeg()))
+
+    def test_changelist_does_not_render_thumbnails(self):
+        Cast.objects.bulk_create([Cast(name='Red', photo=self.photo)])
+        self.client.force_login(get_user_model().objects.create_superuser('staff', 'staff@example.com', 'pw'))
+        with mock.patch.object(thumbnails, 'render_thumbnail') as render:
+            response = self.client.get('/admin/casts/cast/', secure=True)
+        render.assert_not_called()
+        self.assertNotContains(response, 'casts/thumbs/')
+
+        call_command('build_thumbnails', stdout=StringIO())
+        response = self.client.get('/admin/casts/cast/', secure=True)
+        self.assertContains(response, photo_storage().url(existing_thumbnail(self.photo)))
+
+    def test_save_renders_in_the_background_after_commit(self):
+        with mock.patch.object(thumbnails, 'schedule_thumbnail') as schedule:
+            with self.captureOnCommitCallbacks() as callbacks:
+                Cast.objects.create(name='Red', photo=self.photo)
+            schedule.assert_not_called()
+            for callback in callbacks:
+                callback()
+        schedule.assert_called_once_with(self.photo)
+
+    def test_build_thumbnails_renders_missing_ones(self):
+        broken = photo_storage().save('casts/photos/broken.jpg', ContentFile(b'not an image'))
+        Cast.objects.bulk_create([
+            Cast(name='Red', photo=self.photo),
+            Cast(name='Red again', photo=self.photo),
+            Cast(name='Broken', photo=broken),
+            Cast(name='No photo'),
+        ])
+        out = StringIO()
+        with self.assertLogs('casts.thumbnails', 'WARNING'):
+            call_command('build_thumbnails', stdout=out)
+        self.assertIn('Rendered 1 thumbnails', out.getvalue())
+        self.assertIn('1 photos could not be read', out.getvalue())
+        with photo_storage().open(existing_thumbnail(self.photo), 'rb') as fh:
+            from PIL import Image
+
+            self.assertEqual(Image.open(fh).size, (96, 64))
@@ -15,27 +15,36 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path
-from django.http import JsonResponse, HttpResponse
+from django.urls import include, path, re_path
+from django.http import HttpResponse
 from django.conf import settings
-from django.conf.urls.static import static
+from urllib.parse import urlsplit
+from casts.snapshots import snapshot_url
+from casts.views import snapshot_file
+from .fastjson import FastJsonResponse
 from .views_csp import csp_report
-from .views_health import health_check, status
+from .views_health import health_check, readiness_check, status
+from .views_media import serve_media
 
 def home(request):
     """Simple home view showing API is running"""
     try:
-        return JsonResponse({
+        return FastJsonResponse({
             'message': 'LuminaTV API is running',
             'version': '1.0',
             'health_check': '/health/',
-            'api_status': '/status/'
+            'readiness_check': '/health/ready/',
+            'api_status': '/status/',
+            'casts': '/api/casts/',
+            'cast_search': '/api/casts/search/?q=',
+            'cast_autocomplete': '/api/casts/autocomplete/?q=',
+            'cast_snapshot': '/api/casts/snapshot/',
         })
     except Exception as e:
         import logging
         logger = logging.getLogger(__name__)
         logger.error(f"Error in home view: {str(e)}", exc_info=True)
-        return JsonResponse({'error': str(e)}, status=500)
+        return FastJsonResponse({'error': str(e)}, status=500)
 
 def favicon(request):
     """Serve favicon - 204 No Content to suppress browser errors"""
@@ -45,13 +54,20 @@ urlpatterns = [
     path('', home, name='home'),
     path('favicon.ico', favicon, name='favicon'),
     path('admin/', admin.site.urls),
+    path('api/casts/', include('casts.urls')),
     # CSP report receiver
     path('csp-report/', csp_report, name='csp-report'),
     # Health checks (for Render uptime monitoring)
     path('health/', health_check, name='health-check'),
+    path('health/ready/', readiness_check, name='readiness-check'),
     path('status/', status, name='status'),
+    # Catalog snapshot files built after WhiteNoise indexed STATIC_ROOT
+    re_path(r'^%s(?P<path>[^/]+)$' % urlsplit(snapshot_url()).path.lstrip('/'), snapshot_file,
+            name='cast-snapshot-file'),
 ]
 
-# Serve media files during development
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Serve media files (development, or hosts without a separate media server)
+if settings.SERVE_MEDIA:
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.*)$' % settings.MEDIA_URL.lstrip('/'), serve_media, name='media'),
+    ]
@@ -1,9 +1,10 @@
-import json
 import logging
 
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 
+from . import fastjson
+
 logger = logging.getLogger('csp')
 
 # Optional Sentry integration
@@ -26,15 +27,14 @@ def csp_report(request):
             return HttpResponse(status=405)
 
         # Django doesn't automatically parse application/csp-report
-        body = request.body.decode('utf-8') or '{}'
-        data = json.loads(body)
+        data = fastjson.loads(request.body or b'{}')
     except Exception as exc:
         logger.exception('CSP report parse error')
         return HttpResponse(status=400)
 
     # Normalize report content
     report = data.get('csp-report') or data.get('report') or data
-    logger.info('CSP violation reported: %s', json.dumps(report))
+    logger.info('CSP violation reported: %s', fastjson.dumps(report).decode('utf-8'))
 
     # Forward to Sentry if available
     if HAS_SENTRY and sentry_sdk.get_client().is_active():
@@ -45,4 +45,4 @@ def csp_report(request):
         )
 
     # Keep response small; browsers expect 204/200
-    return JsonResponse({'status': 'received'}, status=204)
+    return fastjson.FastJsonResponse({'status': 'received'}, status=204)
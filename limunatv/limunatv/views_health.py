@@ -1,37 +1,174 @@
 """
 Health check and status views for Render.com deployment monitoring.
+
+Two tiers of probes are exposed:
+
+* ``/health/`` (liveness) answers from memory without touching the database,
+  disk or cache, so uptime monitors can poll it as often as they like.
+* ``/health/ready/`` (readiness) reports the state of the service's
+  dependencies. The individual checks run at most once per
+  ``HEALTH_CHECK_CACHE_TTL`` seconds; once a result has gone stale it is still
+  served while a background thread refreshes it.
 """
 
-import json
-from django.http import JsonResponse
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+
 from django.views.decorators.http import require_http_methods
 
+from .fastjson import FastJsonResponse
+
+logger = logging.getLogger(__name__)
+
+_STARTED_AT = time.time()
+
+_readiness_lock = threading.Lock()
+_readiness_cache = {'result': None, 'checked_at': 0.0, 'refreshing': False}
+
+
+def _timed(check):
+    """Run a single dependency check and record its latency in milliseconds."""
+    started = time.perf_counter()
+    try:
+        detail = check() or {}
+        ok = detail.pop('ok', True)
+    except Exception as exc:
+        # Never leak raw exception text to unauthenticated probes.
+        logger.exception('Readiness check %s failed', check.__name__)
+        ok, detail = False, {'error': exc.__class__.__name__}
+    detail['status'] = 'ok' if ok else 'fail'
+    detail['latency_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    return ok, detail
+
+
+def check_database():
+    """Run a trivial query against the default database."""
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    return {'vendor': connection.vendor}
+
+
+def check_disk():
+    """Make sure the volume holding the SQLite database has room to grow."""
+    from django.conf import settings
+    from django.db import connection
+
+    if connection.vendor == 'sqlite':
+        path = os.path.dirname(os.path.abspath(str(connection.settings_dict['NAME'])))
+    else:
+        path = str(settings.BASE_DIR)
+    free_mb = shutil.disk_usage(path).free // (1024 * 1024)
+    min_free_mb = getattr(settings, 'HEALTH_CHECK_MIN_DISK_FREE_MB', 100)
+    return {'ok': free_mb >= min_free_mb, 'free_mb': free_mb}
+
+
+def check_media_storage():
+    """Verify that uploaded media can still be written."""
+    from django.conf import settings
+
+    media_root = str(settings.MEDIA_ROOT)
+    os.makedirs(media_root, exist_ok=True)
+    probe = os.path.join(media_root, f'.healthcheck-{uuid.uuid4().hex}')
+    with open(probe, 'wb') as fh:
+        fh.write(b'ok')
+    os.remove(probe)
+    return {}
+
+
+def check_cache():
+    """Round-trip a value through the default cache backend."""
+    from django.core.cache import cache
+
+    key = f'healthcheck:{uuid.uuid4().hex}'
+    cache.set(key, 'ok', timeout=5)
+    ok = cache.get(key) == 'ok'
+    cache.delete(key)
+    return {'ok': ok}
+
+
+READINESS_CHECKS = {
+    'database': check_database,
+    'disk': check_disk,
+    'media_storage': check_media_storage,
+    'cache': check_cache,
+}
+
+
+def run_readiness_checks():
+    """Run every readiness check and store the combined result."""
+    from django.db import connections
+
+    try:
+        checks = {}
+        healthy = True
+        for name, check in READINESS_CHECKS.items():
+            ok, checks[name] = _timed(check)
+            healthy = healthy and ok
+        result = {'status': 'ready' if healthy else 'unready', 'checks': checks}
+        with _readiness_lock:
+            _readiness_cache['result'] = result
+            _readiness_cache['checked_at'] = time.time()
+        return result
+    finally:
+        with _readiness_lock:
+            _readiness_cache['refreshing'] = False
+        if threading.current_thread() is not threading.main_thread():
+            connections.close_all()
+
+
+def get_readiness():
+    """Return the cached readiness result, refreshing it when stale.
+
+    The first call runs the checks inline. After that a stale result is
+    returned immediately and a single background thread refreshes it.
+    """
+    from django.conf import settings
+
+    ttl = getattr(settings, 'HEALTH_CHECK_CACHE_TTL', 10)
+    with _readiness_lock:
+        result = _readiness_cache['result']
+        age = time.time() - _readiness_cache['checked_at']
+        if result is not None and (age < ttl or _readiness_cache['refreshing']):
+            return result, age
+        _readiness_cache['refreshing'] = True
+
+    if result is None:
+        return run_readiness_checks(), 0.0
+
+    threading.Thread(target=run_readiness_checks, name='readiness-refresh', daemon=True).start()
+    return result, age
+
 
 @require_http_methods(["GET"])
 def health_check(request):
     """
-    Simple health check endpoint for Render uptime monitoring.
-    Returns 200 if service is running, checks DB connectivity.
-    
+    Liveness endpoint for Render uptime monitoring.
+    Returns 200 as long as the process can serve requests; performs no I/O.
+
     Usage in Render dashboard: set Health Check endpoint to /health/
     """
-    try:
-        from django.db import connection
-        
-        # Test database connection
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1")
-        
-        return JsonResponse({
-            'status': 'healthy',
-            'version': '1.0',
-        }, status=200)
-    
-    except Exception as e:
-        return JsonResponse({
-            'status': 'unhealthy',
-            'error': str(e),
-        }, status=503)
+    return FastJsonResponse({
+        'status': 'healthy',
+        'version': '1.0',
+        'uptime_seconds': int(time.time() - _STARTED_AT),
+    }, status=200)
+
+
+@require_http_methods(["GET"])
+def readiness_check(request):
+    """
+    Readiness endpoint: database, disk space, media storage and cache.
+    Returns 503 when any dependency check fails.
+    """
+    result, age = get_readiness()
+    payload = dict(result, cached_seconds=round(age, 2))
+    return FastJsonResponse(payload, status=200 if result['status'] == 'ready' else 503)
 
 
 @require_http_methods(["GET"])
@@ -41,8 +178,8 @@ def status(request):
     """
     import django
     from django.conf import settings
-    
-    return JsonResponse({
+
+    return FastJsonResponse({
         'service': 'luminatv-backend',
         'status': 'ok',
         'django_version': django.get_version(),
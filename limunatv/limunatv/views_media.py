@@ -0,0 +1,91 @@
+"""
+Media file serving with byte ranges and cache headers suited to content-addressed names.
+"""
+
+import re
+
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views.static import serve
+
+from .storage import CONTENT_ADDRESSED_RE
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_range(header, size):
+    """Return the inclusive ``(start, end)`` of a single ``bytes`` range.
+
+    Returns ``None`` when the header should be ignored and the whole file
+    sent: it is malformed, asks for several ranges, or ends before it
+    starts. A ``start`` at or past ``size`` means it cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:  # suffix range: the last N bytes
+        length = int(last)
+        return (max(0, size - length), size - 1) if length else (size, size)
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+def _read(fh, start, length):
+    try:
+        fh.seek(start)
+        while length > 0:
+            chunk = fh.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        fh.close()
+
+
+def _partial(response, byte_range):
+    """Turn ``serve()``'s 200 response into a 206 (or 416) for ``byte_range``."""
+    fh = response.file_to_stream
+    size = int(response['Content-Length'])
+    start, end = byte_range
+    if start >= size:
+        fh.close()
+        unsatisfiable = HttpResponse(status=416)
+        unsatisfiable['Content-Range'] = f'bytes */{size}'
+        return unsatisfiable
+    partial = StreamingHttpResponse(_read(fh, start, end - start + 1), status=206)
+    for header in ('Content-Type', 'Content-Encoding', 'Last-Modified'):
+        if response.has_header(header):
+            partial[header] = response[header]
+    partial['Content-Length'] = str(end - start + 1)
+    partial['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return partial
+
+
+def serve_media(request, path):
+    """Serve a file from MEDIA_ROOT, honouring a single-range ``Range`` header.
+
+    Content-addressed files (``ab/cd/<sha256>.<ext>``) never change under the
+    same name, so clients and CDNs may cache them for a year without
+    revalidating. Anything else gets a short cache lifetime. A request with
+    ``If-Range`` gets the whole file: the range is only safe to apply when
+    the validator matches, and a full answer is always correct.
+    """
+    response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    if response.status_code == 200 and response.streaming and response.has_header('Content-Length'):
+        header = request.headers.get('Range')
+        byte_range = parse_range(header, int(response['Content-Length'])) if header else None
+        if byte_range and 'If-Range' not in request.headers:
+            response = _partial(response, byte_range)
+        response['Accept-Ranges'] = 'bytes'
+    if response.status_code in (200, 206, 304):
+        if CONTENT_ADDRESSED_RE.search(path):
+            response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response['Cache-Control'] = 'public, max-age=300'
+    return response
@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'limunatv.settings')
 
 application = get_wsgi_application()
+
+# Build the autocomplete prefix index before the first keystroke arrives.
+from casts.autocomplete import warm_index  # noqa: E402
+warm_index()
@@ -7,9 +7,21 @@ pip install -r requirements.txt
 echo "Running migrations..."
 python manage.py migrate --no-input
 
+echo "Refreshing planner statistics..."
+python manage.py analyze_db
+
+echo "Checking hot query plans..."
+python manage.py check_query_plans
+
 echo "Collecting static files..."
 python manage.py collectstatic --no-input
 
+echo "Building catalog snapshot..."
+python manage.py build_catalog_snapshot
+
+echo "Rendering missing admin thumbnails..."
+python manage.py build_thumbnails
+
 echo "Verifying deployment configuration..."
 python manage.py check --deploy
 
@@ -8,56 +8,93 @@ This hook runs before each commit, ensuring:
 2. No security issues in code (bandit)
 3. No known CVEs in dependencies (safety)
 4. No debug/test files committed
+
+The checks run concurrently. Bandit only scans the staged Python files and
+both scanners reuse cached results for unchanged content (see
+security_check.py), so a typical commit takes a few seconds. The Django
+deployment check is skipped when nothing under limunatv/ is staged.
 """
 
+import re
 import subprocess
 import sys
-import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
+REPO_ROOT = Path(__file__).resolve().parent
+if REPO_ROOT.name == 'hooks' and REPO_ROOT.parent.name == '.git':
+    REPO_ROOT = REPO_ROOT.parent.parent  # installed as .git/hooks/pre-commit
+LIMUNATV_ROOT = REPO_ROOT / 'limunatv'
+
+
+def run_command(cmd, description, cwd=REPO_ROOT):
+    """Run a command (argument list, no shell) and return ``(passed, output lines)``."""
+    lines = [f"\n▶ {description}..."]
+    result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
 
-def run_command(cmd, description):
-    """Run a command and return True if successful."""
-    print(f"\n▶ {description}...")
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-    
     if result.returncode != 0:
-        print(f"✗ FAILED: {description}")
+        lines.append(f"✗ FAILED: {description}")
         if result.stdout:
-            print("STDOUT:", result.stdout[:500])
+            lines.append("STDOUT: " + result.stdout[-1500:])
         if result.stderr:
-            print("STDERR:", result.stderr[:500])
-        return False
-    
-    print(f"✓ PASSED: {description}")
-    return True
+            lines.append("STDERR: " + result.stderr[-1500:])
+        return False, lines
+
+    lines.append(f"✓ PASSED: {description}")
+    return True, lines
+
+
+def staged_files():
+    result = subprocess.run(
+        ['git', 'diff', '--cached', '--name-only', '--diff-filter=ACMR', '-z'],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    return [name for name in result.stdout.split('\0') if name]
 
 
 def check_for_secrets():
     """Check for common hardcoded secrets."""
-    print("\n▶ Checking for hardcoded secrets...")
-    
+    lines = ["\n▶ Checking for hardcoded secrets..."]
+
     patterns = [
         r'SECRET_KEY\s*=\s*["\'](?!.*-insecure)[a-z0-9\-_]{20,}["\']',
         r'SENTRY_DSN\s*=\s*["\']https://',
         r'password\s*=\s*["\'](?!.*placeholder)[a-z0-9]{8,}["\']',
         r'api[_-]?key\s*=\s*["\'][a-z0-9]{20,}["\']',
     ]
-    
-    result = subprocess.run('git diff --cached', shell=True, capture_output=True, text=True)
+
+    result = subprocess.run(['git', 'diff', '--cached'], cwd=REPO_ROOT, capture_output=True, text=True)
     diff = result.stdout
-    
+
     found = False
     for pattern in patterns:
         if re.search(pattern, diff, re.IGNORECASE):
-            print(f"✗ Potential secret found matching pattern: {pattern[:50]}...")
+            lines.append(f"✗ Potential secret found matching pattern: {pattern[:50]}...")
             found = True
-    
+
     if found:
-        print("Aborting commit. Please review your changes before committing secrets.")
-        return False
-    
-    print("✓ No hardcoded secrets detected")
-    return True
+        lines.append("Aborting commit. Please review your changes before committing secrets.")
+        return False, lines
+
+    lines.append("✓ No hardcoded secrets detected")
+    return True, lines
+
+
+def check_security_scan():
+    return run_command(
+        [sys.executable, 'security_check.py', '--staged'],
+        'Security scan (safety & bandit on staged files)',
+    )
+
+
+def check_django_deploy(files):
+    if not any(name.startswith('limunatv/') or name.startswith('requirements') for name in files):
+        return True, ["\n▶ Django deployment checks...", "✓ SKIPPED: no backend changes staged"]
+    return run_command(
+        [sys.executable, 'manage.py', 'check', '--deploy'],
+        'Django deployment checks',
+        cwd=LIMUNATV_ROOT,
+    )
 
 
 def main():
@@ -65,21 +102,30 @@ def main():
     print("=" * 60)
     print("Running pre-commit security checks...")
     print("=" * 60)
-    
+
+    files = staged_files()
+    # Checks are callables: nothing runs until the pool starts them side by side.
     checks = [
-        (check_for_secrets(), "Hardcoded secrets check"),
-        (run_command('python security_check.py', 'Security scan (safety & bandit)'), 'Security scan'),
-        (run_command('python manage.py check --deploy', 'Django deployment checks'), 'Django check'),
+        (check_for_secrets, "Hardcoded secrets check"),
+        (check_security_scan, 'Security scan'),
+        (lambda: check_django_deploy(files), 'Django check'),
     ]
-    
+
+    with ThreadPoolExecutor(max_workers=len(checks)) as pool:
+        futures = [pool.submit(check) for check, _ in checks]
+        results = [future.result() for future in futures]
+
+    for _, lines in results:
+        print('\n'.join(lines))
+
     # Count passed checks
-    passed = sum(1 for result, _ in checks if result)
+    passed = sum(1 for ok, _ in results if ok)
     total = len(checks)
-    
+
     print("\n" + "=" * 60)
     print(f"Pre-commit checks: {passed}/{total} PASSED")
     print("=" * 60)
-    
+
     # Fail if any check failed
     if passed < total:
         print("\n✗ Commit blocked by failed security checks.")
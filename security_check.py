@@ -3,75 +3,239 @@
 Security scanning script for the Django backend.
 Run locally before commits or in CI/CD pipelines.
 
+Safety and Bandit run concurrently. Results are cached in
+``.security_cache.json``: Bandit findings per file, keyed by the file's
+content hash, and a clean Safety report keyed by the hash of requirements.txt
+(for at most SAFETY_CACHE_TTL seconds, since the CVE database changes).
+Unchanged inputs are not scanned again. With ``--staged`` the staged
+content is exported from the git index and scanned, so partially staged
+files are checked as they will be committed.
+
 Usage:
     python security_check.py
     python security_check.py --json  # Output JSON for CI systems
+    python security_check.py --staged  # Only files staged for commit (pre-commit hook)
+    python security_check.py --files limunatv/casts/views.py limunatv/casts/search.py
+    python security_check.py --no-cache
 """
 
+import argparse
+import hashlib
+import json
+import os
 import subprocess
 import sys
-import json
-import argparse
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-REPO_ROOT = Path(__file__).parent
+REPO_ROOT = Path(__file__).resolve().parent
 LIMUNATV_ROOT = REPO_ROOT / 'limunatv'
+REQUIREMENTS = REPO_ROOT / 'requirements.txt'
+CACHE_FILE = REPO_ROOT / '.security_cache.json'
+CACHE_VERSION = 1
+SAFETY_CACHE_TTL = 24 * 60 * 60
+BANDIT_BATCH_SIZE = 50
+
+# Directories bandit -r skips by default, plus local environments.
+EXCLUDED_DIRS = {'.git', '__pycache__', '.tox', '.eggs', '.venv', 'venv', 'node_modules', 'staticfiles'}
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for block in iter(lambda: fh.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_cache(enabled=True):
+    if enabled and CACHE_FILE.exists():
+        try:
+            with open(CACHE_FILE, encoding='utf-8') as fh:
+                cache = json.load(fh)
+            if cache.get('version') == CACHE_VERSION:
+                return cache
+        except (OSError, ValueError):
+            pass
+    return {'version': CACHE_VERSION, 'safety': {}, 'bandit': {}}
+
+
+def save_cache(cache):
+    tmp = CACHE_FILE.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        json.dump(cache, fh)
+    os.replace(tmp, CACHE_FILE)
+
+
+def all_python_files():
+    """Every Python file under limunatv/, as bandit -r would find them."""
+    files = []
+    for root, dirs, names in os.walk(LIMUNATV_ROOT):
+        dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS and not d.endswith('.egg')]
+        files.extend(Path(root, name) for name in names if name.endswith('.py'))
+    return sorted(files)
+
+
+def staged_python_files():
+    """Repository paths of Python files under limunatv/ added or modified in the index."""
+    result = subprocess.run(
+        ['git', 'diff', '--cached', '--name-only', '--diff-filter=ACMR', '-z'],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    prefix = LIMUNATV_ROOT.relative_to(REPO_ROOT).as_posix() + '/'
+    return sorted(
+        name for name in result.stdout.split('\0')
+        if name.endswith('.py') and name.startswith(prefix)
+    )
+
+
+def export_staged(names, directory):
+    """Write the index version of ``names`` under ``directory``; returns their paths.
+
+    The working tree may differ from what is about to be committed (``git add
+    -p``, edits after staging), so the staged blobs are what gets scanned.
+    """
+    if names:
+        subprocess.run(
+            ['git', 'checkout-index', f'--prefix={directory}/', '-z', '--stdin'],
+            cwd=REPO_ROOT, input='\0'.join(names), text=True, check=True,
+        )
+    return [directory / name for name in names]
 
 
-def run_safety_check():
+def run_safety_check(cache, now):
     """Scan dependencies for known CVEs using safety."""
-    print("\n=== Running Safety (CVE dependency scan) ===")
+    lines = ["\n=== Running Safety (CVE dependency scan) ==="]
+    key = file_hash(REQUIREMENTS)
+    cached = cache['safety'].get(key)
+    if cached and now - cached['checked_at'] < SAFETY_CACHE_TTL:
+        ok, output = cached['ok'], cached['output']
+        lines.append("  (cached: requirements.txt unchanged)")
+    else:
+        try:
+            result = subprocess.run(
+                [sys.executable, '-m', 'safety', 'check', '--file', 'requirements.txt', '--json'],
+                cwd=REPO_ROOT,
+                capture_output=True,
+                text=True,
+            )
+        except FileNotFoundError:
+            lines.append("⚠ Safety not installed. Run: pip install -r requirements-dev.txt")
+            return None, 'safety_not_installed', lines
+        if 'No module named safety' in result.stderr:
+            lines.append("⚠ Safety not installed. Run: pip install -r requirements-dev.txt")
+            return None, 'safety_not_installed', lines
+        ok, output = result.returncode == 0, result.stdout
+        if ok:  # failures are always re-checked
+            cache['safety'] = {key: {'ok': ok, 'output': output, 'checked_at': now}}
+
+    if ok:
+        lines.append("✓ Safety: No known CVEs found in dependencies")
+        return True, None, lines
+    lines.append("✗ Safety: CVE vulnerabilities detected!")
+    lines.append(output)
+    return False, output, lines
+
+
+def _bandit_batch(files):
+    """Run bandit on ``files`` and return ``{path: [issues]}`` for each of them."""
+    result = subprocess.run(
+        [sys.executable, '-m', 'bandit', '-q', '-f', 'json', *map(str, files)],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if 'No module named bandit' in result.stderr:
+        raise FileNotFoundError('bandit')
+    data = json.loads(result.stdout or '{}')
+    found = {str(path): [] for path in files}
+    for issue in data.get('results', []):
+        found.setdefault(issue.get('filename'), []).append(issue)
+    # Files bandit cannot parse are reported as findings rather than passing silently.
+    for error in data.get('errors', []):
+        found.setdefault(error.get('filename'), []).append(
+            {'test_name': 'scan_error', 'line_number': 0, 'issue_text': error.get('reason')})
+    return found
+
+
+def run_bandit_check(files, cache, jobs, root=REPO_ROOT):
+    """Scan Python code for security issues using bandit.
+
+    Only files whose content hash is not in the cache are scanned, split
+    into batches that run in parallel. Findings are reported relative to
+    ``root``.
+    """
+    lines = ["\n=== Running Bandit (code security scan) ==="]
+    hashes = {path: file_hash(path) for path in files}
+    pending = [path for path in files if hashes[path] not in cache['bandit']]
+    if len(pending) < len(files):
+        lines.append(f"  ({len(files) - len(pending)} of {len(files)} file(s) unchanged, using cached results)")
+
+    batches = [pending[i:i + BANDIT_BATCH_SIZE] for i in range(0, len(pending), BANDIT_BATCH_SIZE)]
     try:
-        result = subprocess.run(
-            [sys.executable, '-m', 'safety', 'check', '--file', 'requirements.txt', '--json'],
-            cwd=REPO_ROOT,
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode == 0:
-            print("✓ Safety: No known CVEs found in dependencies")
-            return True, None
-        else:
-            print("✗ Safety: CVE vulnerabilities detected!")
-            print(result.stdout)
-            return False, result.stdout
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            for batch, found in zip(batches, pool.map(_bandit_batch, batches)):
+                for path in batch:
+                    cache['bandit'][hashes[path]] = found.get(str(path), [])
     except FileNotFoundError:
-        print("⚠ Safety not installed. Run: pip install -r requirements-dev.txt")
-        return None, 'safety_not_installed'
+        lines.append("⚠ Bandit not installed. Run: pip install -r requirements-dev.txt")
+        return None, 'bandit_not_installed', lines
 
+    issues = []
+    for path in files:
+        for issue in cache['bandit'][hashes[path]]:
+            issues.append(dict(issue, filename=path.relative_to(root).as_posix()))
 
-def run_bandit_check():
-    """Scan Python code for security issues using bandit."""
-    print("\n=== Running Bandit (code security scan) ===")
-    try:
-        result = subprocess.run(
-            [sys.executable, '-m', 'bandit', '-r', str(LIMUNATV_ROOT), '-f', 'json'],
-            capture_output=True,
-            text=True,
-        )
-        data = json.loads(result.stdout or '{}')
-        issues = data.get('results', [])
+    if not issues:
+        lines.append(f"✓ Bandit: No security issues found in {len(files)} file(s)")
+        return True, None, lines
+    lines.append(f"✗ Bandit: {len(issues)} security issue(s) detected!")
+    for issue in issues:
+        lines.append(f"  - {issue.get('test_name', 'unknown')} in {issue.get('filename')}:{issue.get('line_number')}")
+    return False, {'results': issues}, lines
 
-        if not issues:
-            print("✓ Bandit: No security issues found in code")
-            return True, None
-        else:
-            print(f"✗ Bandit: {len(issues)} security issue(s) detected!")
-            for issue in issues:
-                print(f"  - {issue.get('test_name', 'unknown')} in {issue.get('filename')}:{issue.get('line_number')}")
-            return False, data
-    except FileNotFoundError:
-        print("⚠ Bandit not installed. Run: pip install -r requirements-dev.txt")
-        return None, 'bandit_not_installed'
+
+def prune_cache(cache):
+    """Drop Bandit entries for content that no longer exists in the tree."""
+    live = {file_hash(path) for path in all_python_files()}
+    cache['bandit'] = {key: value for key, value in cache['bandit'].items() if key in live}
 
 
 def main():
     parser = argparse.ArgumentParser(description='Run security checks on Django backend')
     parser.add_argument('--json', action='store_true', help='Output results as JSON')
+    scope = parser.add_mutually_exclusive_group()
+    scope.add_argument('--staged', action='store_true', help='Bandit-scan only files staged for commit')
+    scope.add_argument('--files', nargs='+', type=Path, metavar='PATH', help='Bandit-scan only these files')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore and do not update the result cache')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 2, help='Parallel bandit processes')
     args = parser.parse_args()
 
-    safety_ok, safety_data = run_safety_check()
-    bandit_ok, bandit_data = run_bandit_check()
+    with tempfile.TemporaryDirectory(prefix='security-check-') as staged_root:
+        root = REPO_ROOT
+        if args.staged:
+            root = Path(staged_root).resolve()
+            files = export_staged(staged_python_files(), root)
+        elif args.files:
+            files = sorted(path.resolve() for path in args.files if path.suffix == '.py' and path.exists())
+        else:
+            files = all_python_files()
+
+        cache = load_cache(enabled=not args.no_cache)
+        now = time.time()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            safety = pool.submit(run_safety_check, cache, now)
+            bandit = pool.submit(run_bandit_check, files, cache, max(1, args.jobs), root)
+            safety_ok, safety_data, safety_lines = safety.result()
+            bandit_ok, bandit_data, bandit_lines = bandit.result()
+    print('\n'.join(safety_lines + bandit_lines))
+
+    if not args.no_cache:
+        if not (args.staged or args.files):
+            prune_cache(cache)
+        save_cache(cache)
 
     if args.json:
         results = {